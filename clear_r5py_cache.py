@@ -8,6 +8,17 @@ import shutil
 import os
 import sys
 
+
+def _file_sizes(path):
+    """Yield the size of every file under path, using scandir's cached entry types."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _file_sizes(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry.stat(follow_symlinks=False).st_size
+
+
 # Find r5py cache directory
 # Check common locations
 possible_cache_dirs = [
@@ -34,16 +45,22 @@ if not cache_dir:
 print(f"r5py cache directory: {cache_dir}")
 
 if cache_dir.exists():
-    print(f"Cache size: {sum(f.stat().st_size for f in cache_dir.glob('**/*') if f.is_file()) / 1024 / 1024:.1f} MB")
+    print(f"Cache size: {sum(_file_sizes(cache_dir)) / 1024 / 1024:.1f} MB")
 
     response = input(f"\nDelete all cached transport networks? (yes/no): ")
 
     if response.lower() == 'yes':
         # Delete all .transport_network files
+        with os.scandir(cache_dir) as entries:
+            targets = [
+                entry for entry in entries
+                if entry.is_file(follow_symlinks=False) and entry.name.endswith('.transport_network')
+            ]
+
         deleted = 0
-        for cache_file in cache_dir.glob('*.transport_network'):
-            print(f"  Deleting: {cache_file.name}")
-            cache_file.unlink()
+        for entry in targets:
+            print(f"  Deleting: {entry.name}")
+            os.unlink(entry.path)
             deleted += 1
 
         print(f"\n✓ Deleted {deleted} cached network(s)")
@@ -3,26 +3,22 @@
 Debug script to check r5py output format.
 """
 
+import logging
 import sys
 sys.path.insert(0, 'src')
 
-from r5py_router import R5Router
+from config_loader import load_config
+from router_loader import load_router
 from datetime import datetime
-import yaml
 from pathlib import Path
 
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
 # Load config
-with open('config.yaml', 'r') as f:
-    config = yaml.safe_load(f)
+config = load_config('config.yaml')
 
 print("Initializing r5py router...")
-router = R5Router(
-    gtfs_path=config['gtfs_path'],
-    osm_path="data/pennsylvania.osm.pbf",
-    max_walk_time=15,
-    max_trip_duration=60,
-    walking_speed=config['walking_speed'] * 1.60934
-)
+router = load_router(config, "data/pennsylvania.osm.pbf")
 
 # Test coordinates
 origin_lat, origin_lon = 40.4520, -79.9280  # Shadyside
@@ -5,6 +5,7 @@ Setup script for r5py routing.
 Downloads OSM data and checks dependencies.
 """
 
+import shutil
 import subprocess
 import sys
 from pathlib import Path
@@ -13,9 +14,14 @@ from pathlib import Path
 def check_java():
     """Check if Java is installed."""
     print("Checking for Java...")
+
+    java = shutil.which('java')
     try:
+        if java is None:
+            raise FileNotFoundError('java')
+
         result = subprocess.run(
-            ['java', '-version'],
+            [java, '-version'],
             capture_output=True,
             text=True,
             timeout=5
@@ -54,6 +60,7 @@ def download_osm_data():
 
     try:
         import requests
+        from tqdm import tqdm
 
         # Download from Geofabrik
         # Pennsylvania PBF file (~300MB) - covers Pittsburgh
@@ -70,32 +77,34 @@ def download_osm_data():
         print(f"  URL: {pbf_url}")
         print(f"  Note: This downloads Pennsylvania data (~300MB)")
 
-        response = requests.get(pbf_url, stream=True)
-        response.raise_for_status()
+        # Download to a temporary name so an interrupted download is never
+        # mistaken for a complete PBF file
+        part_path = pbf_path.with_name(pbf_path.name + '.part')
+
+        with requests.Session() as session, session.get(pbf_url, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+
+            # Download with progress, copying in 1MB blocks
+            total_size = int(response.headers.get('content-length') or 0)
 
-        # Download with progress
-        total_size = int(response.headers.get('content-length', 0))
-        block_size = 8192
-        downloaded = 0
+            with open(part_path, 'wb') as f, tqdm.wrapattr(
+                response.raw, 'read',
+                total=total_size or None,
+                desc='  Progress'
+            ) as source:
+                shutil.copyfileobj(source, f, length=1 << 20)
 
-        with open(pbf_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=block_size):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if total_size:
-                        percent = (downloaded / total_size) * 100
-                        print(f"\r  Progress: {percent:.1f}% ({downloaded / 1024 / 1024:.1f} MB)", end='')
+        part_path.replace(pbf_path)
 
-        print()  # New line after progress
         print(f"  ✓ Downloaded to {pbf_path}")
         print(f"  Size: {pbf_path.stat().st_size / 1024 / 1024:.1f} MB")
 
         return pbf_path
 
     except ImportError:
-        print("  ✗ requests library not installed")
-        print("  Install with: pip install requests")
+        print("  ✗ requests or tqdm library not installed")
+        print("  Install with: pip install requests tqdm")
         return None
     except Exception as e:
         print(f"  ✗ Error downloading: {e}")
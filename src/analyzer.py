@@ -5,16 +5,29 @@ Calculates the distribution of travel times for a location by
 sampling every minute throughout the day.
 """
 
+import logging
+import os
+import threading
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Tuple, Dict, Optional
+from collections import OrderedDict
+from datetime import datetime
+from typing import Tuple, Dict, List, Optional
 from pathlib import Path
-import yaml
-from tqdm import tqdm
 
 from r5py_router import R5Router
+from router_loader import load_router
 from geocoder import Geocoder
+from config_loader import load_config
+from geo import haversine_miles
+
+
+# Upper bound on door-to-door transit speed (mph) used to rule out locations
+# that cannot reach work within the maximum trip duration
+MAX_TRANSIT_SPEED_MPH = 45.0
+
+# Decimal places kept in summary statistics of float32 travel times
+STAT_DECIMALS = 3
 
 
 class TimeDistributionAnalyzer:
@@ -27,7 +40,10 @@ class TimeDistributionAnalyzer:
         work_lon: float,
         time_window_start: str = "06:00",
         time_window_end: str = "19:00",
-        analysis_date: str = "2025-11-19"  # Wednesday (within GTFS range)
+        analysis_date: str = "2025-11-19",  # Wednesday (within GTFS range)
+        cache_size: int = 200_000,
+        max_workers: Optional[int] = None,
+        max_transit_speed_mph: float = MAX_TRANSIT_SPEED_MPH
     ):
         """
         Initialize analyzer.
@@ -39,6 +55,10 @@ class TimeDistributionAnalyzer:
             time_window_start: Start time (HH:MM)
             time_window_end: End time (HH:MM)
             analysis_date: Date for analysis (YYYY-MM-DD)
+            cache_size: Maximum number of per-minute routing results to cache
+            max_workers: Concurrent router calls per location (default: cpu_count())
+            max_transit_speed_mph: Straight-line speed no trip can beat, used to
+                skip routing for locations that cannot reach work in time
         """
         self.router = router
         self.work_lat = work_lat
@@ -61,6 +81,86 @@ class TimeDistributionAnalyzer:
             int(date_parts[2])
         )
 
+        # LRU cache of (outbound, return) travel times keyed by
+        # (origin, destination, epoch minute), coordinates rounded to 5 decimals
+        self.cache_size = cache_size
+        self._route_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self.max_workers = max_workers or os.cpu_count()
+        self.max_transit_speed_mph = max_transit_speed_mph
+
+    def clear_cache(self):
+        """Discard all cached routing results."""
+        with self._cache_lock:
+            self._route_cache.clear()
+
+    def _travel_time_matrix(
+        self,
+        home_lats: np.ndarray,
+        home_lons: np.ndarray,
+        timestamps: pd.DatetimeIndex,
+        verbose: bool
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get travel times home→work and work→home for each home and timestamp.
+
+        Minutes already in the cache are served from it; the remaining
+        departures are sent to the router in one batch covering every home
+        with a cache miss. Cache keys use epoch minutes computed for the
+        whole index at once.
+
+        Returns:
+            Tuple of (to_work, from_work) arrays in minutes, shape
+            (homes, timestamps), NaN if unreachable
+        """
+        work = (round(self.work_lat, 5), round(self.work_lon, 5))
+        epoch_minutes = (timestamps.as_unit('s').asi8 // 60).tolist()
+        keys = [
+            [(round(lat, 5), round(lon, 5)) + work + (minute,) for minute in epoch_minutes]
+            for lat, lon in zip(home_lats.tolist(), home_lons.tolist())
+        ]
+
+        shape = (len(home_lats), len(timestamps))
+        to_work = np.full(shape, np.nan, dtype=np.float32)
+        from_work = np.full(shape, np.nan, dtype=np.float32)
+        missing = np.zeros(shape, dtype=bool)
+
+        with self._cache_lock:
+            for h, home_keys in enumerate(keys):
+                for t, key in enumerate(home_keys):
+                    cached = self._route_cache.get(key)
+                    if cached is None:
+                        missing[h, t] = True
+                        continue
+                    self._route_cache.move_to_end(key)
+                    to_work[h, t], from_work[h, t] = cached
+
+        homes = np.flatnonzero(missing.any(axis=1))
+        if len(homes) == 0:
+            return to_work, from_work
+        minutes = np.flatnonzero(missing[homes].any(axis=0))
+
+        outbound, inbound = self.router.calculate_travel_time_matrix_series(
+            home_lats[homes], home_lons[homes],
+            self.work_lat, self.work_lon,
+            timestamps[minutes].to_pydatetime(),
+            verbose=verbose,
+            max_workers=self.max_workers
+        )
+        to_work[np.ix_(homes, minutes)] = outbound
+        from_work[np.ix_(homes, minutes)] = inbound
+
+        with self._cache_lock:
+            for h, home_out, home_back in zip(homes.tolist(), outbound.tolist(), inbound.tolist()):
+                home_keys = keys[h]
+                for t, out_time, back_time in zip(minutes.tolist(), home_out, home_back):
+                    self._route_cache[home_keys[t]] = (out_time, back_time)
+            while len(self._route_cache) > self.cache_size:
+                self._route_cache.popitem(last=False)
+
+        return to_work, from_work
+
     def analyze_location(
         self,
         home_lat: float,
@@ -80,16 +180,39 @@ class TimeDistributionAnalyzer:
 
         Returns:
             Dictionary with:
-                - times: List of all travel times (minutes)
+                - times: Array of all travel times (minutes)
                 - to_work_times: Travel times home→work
                 - from_work_times: Travel times work→home
                 - percentiles: Dict of percentile values
                 - statistics: Mean, median, min, max, std
                 - unreachable_count: Number of times no route found
         """
-        to_work_times = []
-        from_work_times = []
-        unreachable_count = 0
+        return self.analyze_locations(
+            np.array([home_lat]), np.array([home_lon]), verbose=verbose
+        )[0]
+
+    def analyze_locations(
+        self,
+        home_lats: np.ndarray,
+        home_lons: np.ndarray,
+        verbose: bool = True
+    ) -> List[Dict]:
+        """
+        Analyze travel time distributions for many home locations at once.
+
+        All homes are routed together, one r5py matrix computation per
+        departure minute, instead of one computation per home and minute.
+
+        Args:
+            home_lats: Home location latitudes
+            home_lons: Home location longitudes
+            verbose: Show progress bar
+
+        Returns:
+            List of analyze_location() results, one per home, in input order
+        """
+        home_lats = np.asarray(home_lats, dtype=np.float64)
+        home_lons = np.asarray(home_lons, dtype=np.float64)
 
         # Generate all minute timestamps
         start_time = self.analysis_date.replace(
@@ -101,48 +224,64 @@ class TimeDistributionAnalyzer:
             minute=self.end_minute
         )
 
-        current_time = start_time
-        timestamps = []
-        while current_time <= end_time:
-            timestamps.append(current_time)
-            current_time += timedelta(minutes=1)
+        timestamps = pd.date_range(start=start_time, end=end_time, freq='1min')
 
         total_samples = len(timestamps)
-        iterator = tqdm(timestamps, desc="Analyzing") if verbose else timestamps
-
-        for departure_time in iterator:
-            # Home → Work
-            to_work_time = self.router.calculate_route_at_time(
-                home_lat, home_lon,
-                self.work_lat, self.work_lon,
-                departure_time
-            )
 
-            if to_work_time is not None:
-                to_work_times.append(to_work_time)
-            else:
-                unreachable_count += 1
+        # Skip routing entirely for homes where even a straight line at top
+        # transit speed cannot reach work within the maximum trip duration
+        distance_miles = haversine_miles(home_lats, home_lons, self.work_lat, self.work_lon)
+        in_range = np.flatnonzero(
+            distance_miles / self.max_transit_speed_mph * 60 <= self.router.max_trip_duration
+        )
 
-            # Work → Home
-            from_work_time = self.router.calculate_route_at_time(
-                self.work_lat, self.work_lon,
-                home_lat, home_lon,
-                departure_time
+        no_times = np.empty(0, dtype=np.float32)
+        results = [self._result(no_times, no_times, total_samples) for _ in range(len(home_lats))]
+
+        if len(in_range) > 0:
+            # Home → Work and Work → Home, one batched router call per uncached minute
+            to_work, from_work = self._travel_time_matrix(
+                home_lats[in_range], home_lons[in_range], timestamps, verbose
             )
+            for row, h in enumerate(in_range.tolist()):
+                results[h] = self._result(to_work[row], from_work[row], total_samples)
 
-            if from_work_time is not None:
-                from_work_times.append(from_work_time)
-            else:
-                unreachable_count += 1
+        return results
 
-        # Combine all times
-        all_times = to_work_times + from_work_times
+    def _result(
+        self,
+        to_work: np.ndarray,
+        from_work: np.ndarray,
+        total_samples: int
+    ) -> Dict:
+        """
+        Build the analyze_location() result from per-minute travel times.
 
-        if not all_times:
+        Args:
+            to_work: Travel times home→work, NaN where unreachable
+            from_work: Travel times work→home, NaN where unreachable
+            total_samples: Number of departure times per direction
+        """
+        to_work_reachable = ~np.isnan(to_work)
+        from_work_reachable = ~np.isnan(from_work)
+        num_to_work = int(to_work_reachable.sum())
+        num_from_work = int(from_work_reachable.sum())
+
+        # Fill one array with all reachable times; the per-direction arrays
+        # are views into it
+        all_times = np.empty(num_to_work + num_from_work, dtype=np.float32)
+        np.compress(to_work_reachable, to_work, out=all_times[:num_to_work])
+        np.compress(from_work_reachable, from_work, out=all_times[num_to_work:])
+        to_work_times = all_times[:num_to_work]
+        from_work_times = all_times[num_to_work:]
+
+        unreachable_count = 2 * total_samples - len(all_times)
+
+        if len(all_times) == 0:
             return {
-                'times': [],
-                'to_work_times': [],
-                'from_work_times': [],
+                'times': all_times,
+                'to_work_times': to_work_times,
+                'from_work_times': from_work_times,
                 'percentiles': {},
                 'statistics': {},
                 'unreachable_count': unreachable_count,
@@ -150,24 +289,25 @@ class TimeDistributionAnalyzer:
                 'reachable_ratio': 0.0
             }
 
-        # Calculate percentiles
-        percentiles = {
-            '10th': np.percentile(all_times, 10),
-            '25th': np.percentile(all_times, 25),
-            '50th': np.percentile(all_times, 50),
-            '75th': np.percentile(all_times, 75),
-            '80th': np.percentile(all_times, 80),
-            '90th': np.percentile(all_times, 90),
-            '95th': np.percentile(all_times, 95)
-        }
+        # Summary statistics in float64, rounded to the precision float32
+        # holds for minutes; otherwise its rounding noise (42.599998474121094)
+        # ends up in the JSON output
+        times64 = all_times.astype(np.float64)
 
-        # Calculate statistics
+        # Calculate percentiles (one partition for all quantiles)
+        percentile_values = np.percentile(times64, [10, 25, 50, 75, 80, 90, 95]).round(STAT_DECIMALS).tolist()
+        percentiles = dict(zip(
+            ['10th', '25th', '50th', '75th', '80th', '90th', '95th'],
+            percentile_values
+        ))
+
+        # Calculate statistics (median reused from the percentiles above)
         statistics = {
-            'mean': np.mean(all_times),
-            'median': np.median(all_times),
-            'min': np.min(all_times),
-            'max': np.max(all_times),
-            'std': np.std(all_times)
+            'mean': round(float(times64.mean()), STAT_DECIMALS),
+            'median': percentile_values[2],
+            'min': round(float(times64.min()), STAT_DECIMALS),
+            'max': round(float(times64.max()), STAT_DECIMALS),
+            'std': round(float(times64.std()), STAT_DECIMALS)
         }
 
         return {
@@ -191,7 +331,7 @@ class TimeDistributionAnalyzer:
         Returns:
             80th percentile travel time in minutes, or None if no data
         """
-        if not analysis_result['times']:
+        if len(analysis_result['times']) == 0:
             return None
 
         return analysis_result['percentiles']['80th']
@@ -208,7 +348,7 @@ class TimeDistributionAnalyzer:
         print(f"Travel Time Analysis: {location_name}")
         print(f"{'=' * 70}")
 
-        if not analysis_result['times']:
+        if len(analysis_result['times']) == 0:
             print("No routes found!")
             return
 
@@ -230,10 +370,10 @@ class TimeDistributionAnalyzer:
         print(f"  Std Dev:     {analysis_result['statistics']['std']:.1f}")
 
         print(f"\nDirection Breakdown:")
-        if analysis_result['to_work_times']:
+        if len(analysis_result['to_work_times']) > 0:
             print(f"  To work:     {len(analysis_result['to_work_times'])} samples, "
                   f"median {np.median(analysis_result['to_work_times']):.1f} min")
-        if analysis_result['from_work_times']:
+        if len(analysis_result['from_work_times']) > 0:
             print(f"  From work:   {len(analysis_result['from_work_times'])} samples, "
                   f"median {np.median(analysis_result['from_work_times']):.1f} min")
 
@@ -243,8 +383,7 @@ class TimeDistributionAnalyzer:
 def main():
     """Test the time distribution analyzer."""
     # Load config
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config('config.yaml')
 
     print("Initializing r5py router...")
 
@@ -255,13 +394,7 @@ def main():
         print("Run: python setup_r5py.py")
         return
 
-    router = R5Router(
-        gtfs_path=config['gtfs_path'],
-        osm_path=str(osm_path),
-        max_walk_time=int(config['max_walk_to_stop'] * 60 / config['walking_speed']),
-        max_trip_duration=config['max_trip_time'],
-        walking_speed=config['walking_speed'] * 1.60934
-    )
+    router = load_router(config, osm_path)
 
     # Geocode work address
     geocoder = Geocoder()
@@ -297,4 +430,5 @@ def main():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
@@ -2,15 +2,172 @@
 Flask web application for heat map visualization.
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, request, send_file
 from pathlib import Path
-import json
+from typing import Dict, Optional
+import gzip
+import mmap
 import os
+import tempfile
+import numpy as np
+import orjson
 
 # Flask app with template folder pointing to project root
 app = Flask(__name__,
             template_folder=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'templates'))
 
+# Look for heatmap_data.json in project root (parent of src/)
+HEATMAP_FILE = Path(__file__).parent.parent / 'heatmap_data.json'
+
+# Pre-aggregated statistics, regenerated whenever heatmap_data.json is newer
+STATS_FILE = HEATMAP_FILE.with_name('heatmap_stats.json')
+
+# Serialized heat map data (plain and gzip-compressed) and statistics,
+# reloaded when the file's mtime changes
+_cache = {'mtime': None, 'data': None, 'data_gz': None, 'stats': None}
+
+
+def _ojsonify(payload):
+    """Build a JSON response with orjson (accepts objects or pre-serialized bytes)."""
+    if not isinstance(payload, bytes):
+        payload = orjson.dumps(payload)
+    return app.response_class(payload, mimetype='application/json')
+
+
+def _load_heatmap() -> Optional[int]:
+    """
+    Load heat map data into the cache if the file changed since the last load.
+
+    An empty file is treated as missing. A file that does not parse (one
+    the generator is still writing) keeps the previously loaded data, if
+    any, in service.
+
+    Returns:
+        File mtime in nanoseconds of the data in the cache, or None if
+        there is no usable data
+    """
+    try:
+        stat = HEATMAP_FILE.stat()
+    except FileNotFoundError:
+        return None
+    if stat.st_size == 0:
+        return _cache['mtime']
+    mtime = stat.st_mtime_ns
+
+    if mtime != _cache['mtime']:
+        try:
+            with open(HEATMAP_FILE, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view:
+                data = orjson.loads(view)
+        except (ValueError, OSError):
+            # orjson.JSONDecodeError and mmap's empty-file error are ValueErrors
+            return _cache['mtime']
+        stats = _calculate_stats(data)
+
+        _cache['data'] = orjson.dumps(data)
+        _cache['data_gz'] = gzip.compress(_cache['data'])
+        _cache['stats'] = orjson.dumps(stats) if stats is not None else None
+        _cache['mtime'] = mtime
+
+    return mtime
+
+
+def _calculate_stats(data: Dict) -> Optional[Dict]:
+    """
+    Calculate summary statistics for heat map data.
+
+    Args:
+        data: Heat map data as written by the grid generator
+
+    Returns:
+        Statistics dictionary, or None if there are no valid scores
+    """
+    scores = np.fromiter(
+        (p['score'] for p in data['points'] if p['score'] is not None),
+        dtype=np.float64
+    )
+
+    if scores.size == 0:
+        return None
+
+    q25, q50, q75, q90 = np.quantile(scores, [0.25, 0.5, 0.75, 0.9]).tolist()
+
+    return {
+        'total_points': data['total_points'],
+        'rings_analyzed': data['rings_analyzed'],
+        'reachable_points': int(scores.size),
+        'score_min': float(scores.min()),
+        'score_max': float(scores.max()),
+        'score_median': q50,
+        'score_mean': float(scores.mean()),
+        'percentiles': {
+            '25th': q25,
+            '50th': q50,
+            '75th': q75,
+            '90th': q90
+        }
+    }
+
+
+def _ensure_stats() -> Optional[Path]:
+    """
+    Make sure heatmap_stats.json is at least as new as heatmap_data.json.
+
+    A stale or missing stats file is recomputed from the heat map data and
+    atomically replaced.
+
+    Returns:
+        Path to the stats file, or None if there is no data or no valid scores
+    """
+    mtime = _load_heatmap()
+    if mtime is None or _cache['stats'] is None:
+        return None
+
+    try:
+        stat = STATS_FILE.stat()
+        stale = stat.st_size == 0 or stat.st_mtime_ns < mtime
+    except FileNotFoundError:
+        stale = True
+
+    if stale:
+        # A temp file per request, so concurrent requests never write
+        # into the same file before it replaces the stats file
+        fd, tmp_name = tempfile.mkstemp(dir=STATS_FILE.parent, prefix=STATS_FILE.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_cache['stats'])
+            os.replace(tmp_name, STATS_FILE)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    return STATS_FILE
+
+
+def _cached_response(key: str, mtime: int):
+    """
+    Build a JSON response from the cache that browsers can revalidate.
+
+    Clients that accept gzip get the precompressed copy.
+
+    Args:
+        key: Cache entry to serve (e.g. 'data', compressed copy in 'data_gz')
+        mtime: Heat map file mtime, used as the ETag
+    """
+    if 'gzip' in request.accept_encodings:
+        response = _ojsonify(_cache[f'{key}_gz'])
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(f'{mtime}-gz')
+    else:
+        response = _ojsonify(_cache[key])
+        response.set_etag(str(mtime))
+
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = 60
+    return response.make_conditional(request)
+
 
 @app.route('/')
 def index():
@@ -21,60 +178,29 @@ def index():
 @app.route('/api/heatmap')
 def get_heatmap_data():
     """API endpoint to fetch heat map data."""
-    # Look for heatmap_data.json in project root (parent of src/)
-    project_root = Path(__file__).parent.parent
-    heatmap_file = project_root / 'heatmap_data.json'
+    mtime = _load_heatmap()
 
-    if not heatmap_file.exists():
-        return jsonify({
+    if mtime is None:
+        return _ojsonify({
             'error': 'Heat map data not found',
             'message': 'Run grid_generator.py to generate heat map data first'
         }), 404
 
-    with open(heatmap_file, 'r') as f:
-        data = json.load(f)
-
-    return jsonify(data)
+    return _cached_response('data', mtime)
 
 
 @app.route('/api/stats')
 def get_stats():
     """API endpoint to fetch heat map statistics."""
-    # Look for heatmap_data.json in project root (parent of src/)
-    project_root = Path(__file__).parent.parent
-    heatmap_file = project_root / 'heatmap_data.json'
+    if _load_heatmap() is None:
+        return _ojsonify({'error': 'Heat map data not found'}), 404
 
-    if not heatmap_file.exists():
-        return jsonify({'error': 'Heat map data not found'}), 404
+    stats_file = _ensure_stats()
 
-    with open(heatmap_file, 'r') as f:
-        data = json.load(f)
-
-    # Calculate statistics
-    scores = [p['score'] for p in data['points'] if p['score'] is not None]
-
-    if not scores:
-        return jsonify({'error': 'No valid scores in heat map data'}), 400
-
-    import numpy as np
-
-    stats = {
-        'total_points': data['total_points'],
-        'rings_analyzed': data['rings_analyzed'],
-        'reachable_points': len(scores),
-        'score_min': min(scores),
-        'score_max': max(scores),
-        'score_median': float(np.median(scores)),
-        'score_mean': float(np.mean(scores)),
-        'percentiles': {
-            '25th': float(np.percentile(scores, 25)),
-            '50th': float(np.percentile(scores, 50)),
-            '75th': float(np.percentile(scores, 75)),
-            '90th': float(np.percentile(scores, 90))
-        }
-    }
+    if stats_file is None:
+        return _ojsonify({'error': 'No valid scores in heat map data'}), 400
 
-    return jsonify(stats)
+    return send_file(stats_file, mimetype='application/json', conditional=True, max_age=60)
 
 
 if __name__ == '__main__':
@@ -10,11 +10,12 @@ Usage:
 """
 
 import argparse
+import logging
 from datetime import datetime
 from gtfs_loader import GTFSLoader
 from street_network import StreetNetwork
 from router import Router
-import yaml
+from config_loader import load_config
 
 
 def main():
@@ -32,8 +33,7 @@ def main():
     args = parser.parse_args()
 
     # Load config
-    with open(args.config, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config(args.config)
 
     # Initialize components
     print("Loading GTFS data...")
@@ -82,4 +82,5 @@ def main():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
@@ -0,0 +1,29 @@
+"""
+Shared config.yaml loading.
+
+Every script reads its settings through load_config(), which parses with
+libyaml's C loader when PyYAML was built with it.
+"""
+
+from typing import Dict
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+
+def load_config(path: str = 'config.yaml') -> Dict:
+    """
+    Load a YAML config file.
+
+    Args:
+        path: Path to the config file
+
+    Returns:
+        Parsed config dictionary
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_Loader)
@@ -7,8 +7,9 @@ Usage:
 """
 
 import argparse
+import logging
 from gtfs_loader import GTFSLoader
-import yaml
+from config_loader import load_config
 
 
 def main():
@@ -42,8 +43,7 @@ def main():
     args = parser.parse_args()
 
     # Load config
-    with open(args.config, 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config(args.config)
 
     # Load GTFS data
     loader = GTFSLoader(config['gtfs_path'])
@@ -60,14 +60,13 @@ def main():
     print(f"\nFound {len(nearby_stops)} stops:\n")
     print("=" * 80)
 
-    for idx, stop in nearby_stops.iterrows():
-        routes = loader.get_routes_for_stop(stop['stop_id'])
-        route_names = ', '.join(routes['route_short_name'].astype(str).tolist())
+    for stop in nearby_stops.itertuples(index=False):
+        route_names = ', '.join(loader.route_names_for_stop(stop.stop_id))
 
-        print(f"\n{stop['stop_name']}")
-        print(f"  Stop ID: {stop['stop_id']}")
-        print(f"  Distance: {stop['distance_miles']:.3f} miles")
-        print(f"  Location: {stop['stop_lat']:.6f}, {stop['stop_lon']:.6f}")
+        print(f"\n{stop.stop_name}")
+        print(f"  Stop ID: {stop.stop_id}")
+        print(f"  Distance: {stop.distance_miles:.3f} miles")
+        print(f"  Location: {stop.stop_lat:.6f}, {stop.stop_lon:.6f}")
         print(f"  Routes: {route_names}")
 
     print("\n" + "=" * 80)
@@ -75,4 +74,5 @@ def main():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
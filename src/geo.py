@@ -0,0 +1,45 @@
+"""
+Geographic helpers shared across the project.
+
+Positions are WGS84 lon/lat on input and output; distances on the ground
+are measured in PA State Plane South (EPSG:2272, feet) or, for
+great-circle distances, in miles.
+"""
+
+import numpy as np
+import pyproj
+
+
+# Mean Earth radius in miles
+EARTH_RADIUS_MILES = 3959.0
+
+# WGS84 lon/lat <-> PA State Plane South (feet); the CRS pair never changes,
+# so the transformers are built once. always_xy keeps (lon, lat) order.
+TO_STATEPLANE = pyproj.Transformer.from_crs('EPSG:4326', 'EPSG:2272', always_xy=True)
+TO_WGS84 = pyproj.Transformer.from_crs('EPSG:2272', 'EPSG:4326', always_xy=True)
+
+
+def haversine_miles(lat1, lon1, lat2, lon2):
+    """
+    Calculate great-circle distance using the Haversine formula.
+
+    Accepts scalars or NumPy arrays (broadcast against each other).
+
+    Returns:
+        Distance in miles
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
+
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+
+def unit_xyz(lat, lon) -> np.ndarray:
+    """Convert degrees latitude/longitude to 3D points on the unit sphere."""
+    lat = np.radians(lat)
+    lon = np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)], axis=-1)
@@ -4,24 +4,92 @@ Geocoding utilities for converting addresses to coordinates.
 
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
-from typing import Tuple, Optional
+from geopy.extra.rate_limiter import AsyncRateLimiter
+from pathlib import Path
+from typing import Any, List, Tuple, Optional
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
 import time
 
 
+USER_AGENT = "pittsburgh-commute-analyzer"
+
+# Geocoding results shared across runs and processes
+DEFAULT_CACHE_PATH = os.path.expanduser('~/.cache/pittsburgh-commute/geocode.sqlite')
+
+# How long a cached result is trusted (seconds)
+CACHE_EXPIRE_SECONDS = 30 * 24 * 3600
+
+
+class GeocodeCache:
+    """Persistent key/value store for geocoding results, backed by SQLite."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        Open (creating if needed) the cache database.
+
+        Args:
+            path: SQLite database file
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS geocode ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)'
+        )
+
+    @staticmethod
+    def key(text: str) -> str:
+        """Hash normalized text (case and whitespace folded) into a cache key."""
+        normalized = re.sub(r'\s+', ' ', text.strip().lower())
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        row = self._db.execute(
+            'SELECT value FROM geocode WHERE key = ? AND expires > ?',
+            (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, expire: float = CACHE_EXPIRE_SECONDS) -> None:
+        """Store a JSON-serializable value under key."""
+        with self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO geocode (key, value, expires) VALUES (?, ?, ?)',
+                (key, json.dumps(value), time.time() + expire)
+            )
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+
 class Geocoder:
     """Geocode addresses to coordinates."""
 
-    def __init__(self):
-        """Initialize geocoder with Nominatim (OpenStreetMap)."""
+    def __init__(self, cache_path: str = DEFAULT_CACHE_PATH):
+        """
+        Initialize geocoder with Nominatim (OpenStreetMap).
+
+        Args:
+            cache_path: SQLite file for results kept between runs
+        """
         self.geolocator = Nominatim(
-            user_agent="pittsburgh-commute-analyzer",
+            user_agent=USER_AGENT,
             timeout=10
         )
-        self._cache = {}
+        self._cache = GeocodeCache(cache_path)
 
         # Pre-cache known Pittsburgh locations
-        self._cache["5000 forbes ave, pittsburgh, pa"] = (40.4435, -79.9455)
-        self._cache["carnegie mellon university, pittsburgh, pa"] = (40.4435, -79.9455)
+        for known_address in ("5000 forbes ave, pittsburgh, pa",
+                              "carnegie mellon university, pittsburgh, pa"):
+            known_key = GeocodeCache.key(known_address)
+            if known_key not in self._cache:
+                self._cache.set(known_key, (40.4435, -79.9455))
 
     def geocode(
         self,
@@ -41,19 +109,17 @@ class Geocoder:
             Tuple of (lat, lon) or None if geocoding fails
         """
         # Check cache
-        cache_key = f"{address}, {city}, {state}".lower()
-        if cache_key in self._cache:
-            return self._cache[cache_key]
-
-        # Build full address
-        full_address = f"{address}, {city}, {state}, USA"
+        cache_key, full_address = self._query(address, city, state)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return tuple(cached)
 
         try:
             location = self.geolocator.geocode(full_address)
 
             if location:
                 result = (location.latitude, location.longitude)
-                self._cache[cache_key] = result
+                self._cache.set(cache_key, result)
                 return result
             else:
                 print(f"Warning: Could not geocode '{full_address}'")
@@ -63,6 +129,83 @@ class Geocoder:
             print(f"Geocoding error: {e}")
             return None
 
+    async def geocode_many(
+        self,
+        addresses: List[str],
+        city: str = "Pittsburgh",
+        state: str = "PA"
+    ) -> List[Optional[Tuple[float, float]]]:
+        """
+        Geocode several addresses concurrently over one HTTP session.
+
+        Requests are spaced at least one second apart, per the Nominatim
+        usage policy. Requires aiohttp.
+
+        Args:
+            addresses: Street addresses
+            city: City name (default: Pittsburgh)
+            state: State abbreviation (default: PA)
+
+        Returns:
+            List of (lat, lon) or None for each address, in input order
+        """
+        from geopy.adapters import AioHTTPAdapter
+
+        queries = [self._query(address, city, state) for address in addresses]
+
+        # Only look up each uncached address once
+        pending = {key: full_address for key, full_address in queries
+                   if key not in self._cache}
+
+        if pending:
+            async with Nominatim(
+                user_agent=USER_AGENT,
+                timeout=10,
+                adapter_factory=AioHTTPAdapter
+            ) as geolocator:
+                geocode = AsyncRateLimiter(geolocator.geocode, min_delay_seconds=1.0)
+                locations = await asyncio.gather(
+                    *(geocode(full_address) for full_address in pending.values()),
+                    return_exceptions=True
+                )
+
+            for (cache_key, full_address), location in zip(pending.items(), locations):
+                if isinstance(location, Exception):
+                    print(f"Geocoding error: {location}")
+                elif location:
+                    self._cache.set(cache_key, (location.latitude, location.longitude))
+                else:
+                    print(f"Warning: Could not geocode '{full_address}'")
+
+        results = [self._cache.get(key) for key, _ in queries]
+        return [tuple(result) if result is not None else None for result in results]
+
+    def geocode_batch(
+        self,
+        addresses: List[str],
+        city: str = "Pittsburgh",
+        state: str = "PA"
+    ) -> List[Optional[Tuple[float, float]]]:
+        """
+        Synchronous wrapper around geocode_many().
+
+        Args:
+            addresses: Street addresses
+            city: City name (default: Pittsburgh)
+            state: State abbreviation (default: PA)
+
+        Returns:
+            List of (lat, lon) or None for each address, in input order
+        """
+        return asyncio.run(self.geocode_many(addresses, city, state))
+
+    @staticmethod
+    def _query(address: str, city: str, state: str) -> Tuple[str, str]:
+        """Build the cache key and full query string for an address."""
+        cache_key = GeocodeCache.key(f"{address}, {city}, {state}")
+        full_address = f"{address}, {city}, {state}, USA"
+        return cache_key, full_address
+
     def reverse_geocode(
         self,
         lat: float,
@@ -78,9 +221,15 @@ class Geocoder:
         Returns:
             Address string or None if reverse geocoding fails
         """
+        cache_key = f"reverse:{round(lat, 5)},{round(lon, 5)}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             location = self.geolocator.reverse((lat, lon))
             if location:
+                self._cache.set(cache_key, location.address)
                 return location.address
             return None
         except (GeocoderTimedOut, GeocoderServiceError) as e:
@@ -7,18 +7,114 @@ for each grid point.
 
 import numpy as np
 import pandas as pd
-import geopandas as gpd
-from shapely.geometry import Point
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
+import argparse
+import functools
 import json
-import yaml
+import logging
+import os
 from datetime import datetime
-from tqdm import tqdm
 
-from r5py_router import R5Router
-from analyzer import TimeDistributionAnalyzer
+from config_loader import load_config
+from router_loader import load_router, input_fingerprint
+from analyzer import TimeDistributionAnalyzer, MAX_TRANSIT_SPEED_MPH
 from geocoder import Geocoder
+from geo import TO_STATEPLANE, TO_WGS84, haversine_miles
+from result_cache import PointResultCache, result_context
+
+
+# Per-point statistics kept in the heat map results
+STATISTIC_NAMES = ('min', 'median', 'max', 'mean')
+
+
+def print_heatmap_summary(results: Dict):
+    """
+    Print summary of heat map generation.
+
+    Shared by the serial and parallel generators; the parallel generator's
+    results also carry the number of workers, and carry reachable 'scores'
+    in place of 'points' when the points were streamed to a file.
+
+    Args:
+        results: Results dictionary from generate_heatmap()
+    """
+    print(f"\n{'=' * 70}")
+    print("Heat Map Generation Summary")
+    print(f"{'=' * 70}")
+    print(f"\nWork Location: {results['work_location']['lat']:.6f}, {results['work_location']['lon']:.6f}")
+    print(f"Grid Spacing: {results['grid_spacing_feet']} feet")
+    if 'num_workers' in results:
+        print(f"Parallel Workers: {results['num_workers']}")
+    print(f"Rings Analyzed: {results['rings_analyzed']}")
+    print(f"Total Points: {results['total_points']}")
+    print(f"Stopped: {results['stopped_reason']}")
+
+    # Calculate score statistics from one sorted array: min and max are
+    # its ends, and the quartiles interpolate between neighbours
+    if 'scores' in results:
+        scores = np.sort(np.asarray(results['scores'], dtype=np.float64))
+    else:
+        scores = np.sort(np.fromiter(
+            (p['score'] for p in results['points'] if p['score'] is not None),
+            dtype=np.float64
+        ))
+    if scores.size > 0:
+        q25, q50, q75 = np.percentile(scores, [25, 50, 75])
+        print(f"\nScore Distribution (80th percentile travel time):")
+        print(f"  Minimum:  {scores[0]:.1f} minutes")
+        print(f"  25th %:   {q25:.1f} minutes")
+        print(f"  Median:   {q50:.1f} minutes")
+        print(f"  75th %:   {q75:.1f} minutes")
+        print(f"  Maximum:  {scores[-1]:.1f} minutes")
+
+    reachable_points = scores.size
+    print(f"\nReachability: {reachable_points}/{results['total_points']} points ({reachable_points/results['total_points']*100:.1f}%)")
+
+    print(f"\n{'=' * 70}\n")
+
+
+@functools.lru_cache(maxsize=256)
+def _ring_points(
+    work_x: float,
+    work_y: float,
+    spacing: float,
+    ring_number: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lat/lon of the grid intersections on the perimeter of a ring.
+
+    Memoized: the ring is a pure function of its arguments. The returned
+    arrays are shared between callers, so they are read-only.
+
+    Args:
+        work_x: Work location X in PA State Plane feet
+        work_y: Work location Y in PA State Plane feet
+        spacing: Grid spacing in feet
+        ring_number: Ring number (> 0)
+
+    Returns:
+        Tuple of (lats, lons) arrays
+    """
+    # Grid intersections on the perimeter of the ring, walked edge by edge
+    # (each edge starts at its corner), so only the 8 * ring points are built
+    r = ring_number
+    k = np.arange(-r, r)
+    edge = np.full(2 * r, r)
+    i = np.concatenate([k, edge, -k, -edge])
+    j = np.concatenate([-edge, k, edge, -k])
+    xs = work_x + i * spacing
+    ys = work_y + j * spacing
+    lons, lats = TO_WGS84.transform(xs, ys)
+
+    lats.setflags(write=False)
+    lons.setflags(write=False)
+    return lats, lons
+
+
+def _metadata_path(parquet_path: Path) -> Path:
+    """JSON sidecar holding run metadata for a Parquet results file."""
+    return parquet_path.with_name(parquet_path.stem + '.meta.json')
 
 
 class GridHeatMapGenerator:
@@ -30,7 +126,9 @@ class GridHeatMapGenerator:
         work_lat: float,
         work_lon: float,
         grid_spacing_feet: int = 500,
-        max_score_threshold: int = 60  # minutes
+        max_score_threshold: int = 60,  # minutes
+        results_cache_path: Optional[str] = 'heatmap_cache.db',
+        max_transit_speed_mph: float = MAX_TRANSIT_SPEED_MPH
     ):
         """
         Initialize grid heat map generator.
@@ -41,50 +139,48 @@ class GridHeatMapGenerator:
             work_lon: Work location longitude
             grid_spacing_feet: Distance between grid points in feet
             max_score_threshold: Stop expanding when all points exceed this score
+            results_cache_path: SQLite file where each point's result is saved as
+                soon as it is analyzed, so runs can resume (None to disable)
+            max_transit_speed_mph: Straight-line speed no trip can beat; points
+                that cannot score under the threshold at this speed are not routed
         """
         self.analyzer = analyzer
         self.work_lat = work_lat
         self.work_lon = work_lon
         self.grid_spacing_feet = grid_spacing_feet
         self.max_score_threshold = max_score_threshold
+        self.max_transit_speed_mph = max_transit_speed_mph
 
         # Convert work location to state plane coordinates (feet)
         self._init_projections()
 
+        # Point results depend on the work location, the analysis window,
+        # the router's limits, the distance gate and pruning, and the
+        # GTFS/OSM data the router was built from
+        self._results_cache = None
+        if results_cache_path:
+            router = analyzer.router
+            context = result_context(
+                work_lat, work_lon,
+                f"{analyzer.start_hour:02d}:{analyzer.start_minute:02d}",
+                f"{analyzer.end_hour:02d}:{analyzer.end_minute:02d}",
+                f"{analyzer.analysis_date:%Y-%m-%d}",
+                router.max_walk_time,
+                router.max_trip_duration,
+                router.walking_speed,
+                analyzer.max_transit_speed_mph,
+                input_fingerprint(router.gtfs_path, router.osm_path),
+                prune_speed_mph=max_transit_speed_mph,
+                prune_threshold=max_score_threshold
+            )
+            self._results_cache = PointResultCache(results_cache_path, context)
+
     def _init_projections(self):
         """Initialize coordinate projections."""
-        # Create point in WGS84
-        work_point_wgs84 = Point(self.work_lon, self.work_lat)
-        work_gdf = gpd.GeoDataFrame(
-            {'geometry': [work_point_wgs84]},
-            crs='EPSG:4326'
-        )
-
         # Convert to PA State Plane South (feet)
-        work_projected = work_gdf.to_crs('EPSG:2272')
-        self.work_x = work_projected.geometry[0].x
-        self.work_y = work_projected.geometry[0].y
+        self.work_x, self.work_y = TO_STATEPLANE.transform(self.work_lon, self.work_lat)
 
-    def _grid_to_latlon(self, x: float, y: float) -> Tuple[float, float]:
-        """
-        Convert grid coordinates (PA State Plane feet) to lat/lon.
-
-        Args:
-            x: X coordinate in feet
-            y: Y coordinate in feet
-
-        Returns:
-            Tuple of (latitude, longitude)
-        """
-        point = Point(x, y)
-        gdf = gpd.GeoDataFrame(
-            {'geometry': [point]},
-            crs='EPSG:2272'
-        )
-        gdf_wgs84 = gdf.to_crs('EPSG:4326')
-        return gdf_wgs84.geometry[0].y, gdf_wgs84.geometry[0].x
-
-    def generate_ring_points(self, ring_number: int) -> List[Tuple[float, float]]:
+    def generate_ring_points(self, ring_number: int) -> Tuple[np.ndarray, np.ndarray]:
         """
         Generate grid points for a given ring around work location.
 
@@ -96,27 +192,93 @@ class GridHeatMapGenerator:
             ring_number: Ring number (0 = center, 1 = first ring, etc.)
 
         Returns:
-            List of (lat, lon) tuples for points in this ring
+            Tuple of (lats, lons) arrays for points in this ring
         """
         if ring_number == 0:
-            return [(self.work_lat, self.work_lon)]
+            return np.array([self.work_lat]), np.array([self.work_lon])
+
+        return _ring_points(self.work_x, self.work_y, self.grid_spacing_feet, ring_number)
+
+    def _point_result(self, lat: float, lon: float, ring: int, analysis: Dict) -> Dict:
+        """Summarize an analyze_location() result for the heat map."""
+        return {
+            'lat': lat,
+            'lon': lon,
+            'score': self.analyzer.get_score(analysis),
+            'ring': ring,
+            'reachable_ratio': analysis['reachable_ratio'],
+            'statistics': {
+                'min': analysis['statistics'].get('min'),
+                'median': analysis['statistics'].get('median'),
+                'max': analysis['statistics'].get('max'),
+                'mean': analysis['statistics'].get('mean')
+            } if analysis['statistics'] else None
+        }
 
-        points = []
-        spacing = self.grid_spacing_feet
-        distance = ring_number * spacing
-
-        # Generate points along the ring
-        # For a square grid, we need points at each grid intersection
-        for i in range(-ring_number, ring_number + 1):
-            for j in range(-ring_number, ring_number + 1):
-                # Only include points on the perimeter of the ring
-                if abs(i) == ring_number or abs(j) == ring_number:
-                    x = self.work_x + (i * spacing)
-                    y = self.work_y + (j * spacing)
-                    lat, lon = self._grid_to_latlon(x, y)
-                    points.append((lat, lon))
-
-        return points
+    def _analyze_points(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        ring: int,
+        in_reach: np.ndarray,
+        verbose: bool
+    ) -> List[Dict]:
+        """
+        Analyze points in one batch (all origins share each r5py computation).
+
+        Points already in the results cache are not routed again; new results
+        are added to it once the batch completes. Points out of reach are
+        recorded without a score.
+
+        Args:
+            lats: Point latitudes
+            lons: Point longitudes
+            ring: Ring the points belong to
+            in_reach: Mask of points that may score under the threshold
+            verbose: Show progress bar
+
+        Returns:
+            Point results, in the same order as the points
+        """
+        points = list(zip(lats.tolist(), lons.tolist()))
+        point_results = [None] * len(points)
+        pending = []
+
+        for k, (lat, lon) in enumerate(points):
+            if not in_reach[k]:
+                point_results[k] = {
+                    'lat': lat,
+                    'lon': lon,
+                    'score': None,
+                    'ring': ring,
+                    'reachable_ratio': 0.0,
+                    'statistics': None
+                }
+                continue
+
+            cached = self._results_cache.get(lat, lon) if self._results_cache else None
+            if cached is not None:
+                point_results[k] = dict(cached, ring=ring)
+            else:
+                pending.append(k)
+
+        num_cached = int(in_reach.sum()) - len(pending)
+        if verbose and num_cached > 0:
+            print(f"  {num_cached} points loaded from cache")
+
+        if pending:
+            analyses = self.analyzer.analyze_locations(lats[pending], lons[pending], verbose=verbose)
+
+            for k, analysis in zip(pending, analyses):
+                lat, lon = points[k]
+                point_results[k] = self._point_result(lat, lon, ring, analysis)
+                if self._results_cache:
+                    self._results_cache.put(lat, lon, point_results[k])
+
+            if self._results_cache:
+                self._results_cache.commit()
+
+        return point_results
 
     def generate_heatmap(
         self,
@@ -129,7 +291,7 @@ class GridHeatMapGenerator:
 
         Args:
             max_rings: Maximum number of rings to analyze
-            save_path: Path to save results JSON (optional)
+            save_path: Path to save results, .json or .parquet (optional)
             verbose: Show progress
 
         Returns:
@@ -164,49 +326,50 @@ class GridHeatMapGenerator:
         print()
 
         for ring in range(max_rings + 1):
-            ring_points = self.generate_ring_points(ring)
+            lats, lons = self.generate_ring_points(ring)
 
             if verbose:
-                print(f"\nRing {ring}: {len(ring_points)} points")
+                print(f"\nRing {ring}: {len(lats)} points")
 
-            ring_results = []
-            ring_scores = []
+            # Lower bound on every score: a straight line at top transit speed
+            min_minutes = (
+                haversine_miles(lats, lons, self.work_lat, self.work_lon)
+                / self.max_transit_speed_mph * 60
+            )
+            in_reach = min_minutes <= self.max_score_threshold
 
-            iterator = tqdm(ring_points, desc=f"  Analyzing") if verbose else ring_points
+            if not in_reach.any():
+                results['stopped_reason'] = f'Lower-bound pruning ring {ring}'
+                if verbose:
+                    print(f"\n✓ Stopping: No point in ring can beat {self.max_score_threshold} min threshold")
+                break
 
-            for lat, lon in iterator:
-                # Analyze this point
-                analysis = self.analyzer.analyze_location(lat, lon, verbose=False)
-                score = self.analyzer.get_score(analysis)
+            if verbose and not in_reach.all():
+                print(f"  {int((~in_reach).sum())} points too far to beat threshold, skipped")
 
-                point_result = {
-                    'lat': lat,
-                    'lon': lon,
-                    'score': score,
-                    'ring': ring,
-                    'reachable_ratio': analysis['reachable_ratio'],
-                    'statistics': {
-                        'min': analysis['statistics'].get('min'),
-                        'median': analysis['statistics'].get('median'),
-                        'max': analysis['statistics'].get('max'),
-                        'mean': analysis['statistics'].get('mean')
-                    } if analysis['statistics'] else None
-                }
+            ring_results = []
+            ring_scores = np.full(len(lats), np.nan, dtype=np.float64)
+
+            point_results = self._analyze_points(lats, lons, ring, in_reach, verbose)
+
+            for k, point_result in enumerate(point_results):
+                score = point_result['score']
 
                 ring_results.append(point_result)
                 results['points'].append(point_result)
 
                 if score is not None:
-                    ring_scores.append(score)
+                    ring_scores[k] = score
 
             results['rings_analyzed'] = ring + 1
             results['total_points'] = len(results['points'])
 
             # Check stopping condition
-            if ring_scores:
-                min_score = min(ring_scores)
-                max_score = max(ring_scores)
-                avg_score = np.mean(ring_scores)
+            ring_scores = ring_scores[~np.isnan(ring_scores)]
+            if ring_scores.size > 0:
+                min_score = ring_scores.min()
+                max_score = ring_scores.max()
+                avg_score = ring_scores.mean()
 
                 if verbose:
                     print(f"  Ring scores: min={min_score:.1f}, avg={avg_score:.1f}, max={max_score:.1f}")
@@ -229,11 +392,94 @@ class GridHeatMapGenerator:
 
         # Save results if path provided
         if save_path:
-            save_path = Path(save_path)
-            save_path.parent.mkdir(parents=True, exist_ok=True)
+            save_path = self.save(results, save_path)
+            print(f"\n✓ Saved heat map data to {save_path}")
+
+        return results
+
+    @staticmethod
+    def save(results: Dict, save_path: str) -> Path:
+        """
+        Save heat map results.
+
+        A .parquet path gets one row per point (statistics flattened into
+        stat_* columns, zstd-compressed) plus a small JSON sidecar with the
+        run metadata; any other path gets the full results as JSON, which
+        is what the web viewer reads.
+
+        Args:
+            results: Results dictionary from generate_heatmap()
+            save_path: Output file path
+
+        Returns:
+            Path the points were written to
+        """
+        save_path = Path(save_path)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if save_path.suffix != '.parquet':
             with open(save_path, 'w') as f:
                 json.dump(results, f, indent=2)
-            print(f"\n✓ Saved heat map data to {save_path}")
+            return save_path
+
+        points = results['points']
+        statistics = [p['statistics'] or {} for p in points]
+        df = pd.DataFrame({
+            'lat': np.array([p['lat'] for p in points], dtype=np.float64),
+            'lon': np.array([p['lon'] for p in points], dtype=np.float64),
+            'score': np.array([p['score'] for p in points], dtype=np.float64),
+            'ring': np.array([p['ring'] for p in points], dtype=np.int32),
+            'reachable_ratio': np.array([p['reachable_ratio'] for p in points], dtype=np.float64),
+            **{
+                f'stat_{name}': np.array([st.get(name) for st in statistics], dtype=np.float64)
+                for name in STATISTIC_NAMES
+            }
+        })
+        df.to_parquet(save_path, compression='zstd', index=False)
+
+        metadata = {key: value for key, value in results.items() if key != 'points'}
+        with open(_metadata_path(save_path), 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+        return save_path
+
+    @staticmethod
+    def load(path: str) -> Dict:
+        """
+        Load heat map results written by save().
+
+        Args:
+            path: .parquet or .json results file
+
+        Returns:
+            Results dictionary in the same form generate_heatmap() returns
+        """
+        path = Path(path)
+
+        if path.suffix != '.parquet':
+            with open(path, 'r') as f:
+                return json.load(f)
+
+        with open(_metadata_path(path), 'r') as f:
+            results = json.load(f)
+
+        df = pd.read_parquet(path)
+        columns = {name: df[name].tolist() for name in df.columns}
+        points = []
+        for i in range(len(df)):
+            reachable = not np.isnan(columns['stat_min'][i])
+            score = columns['score'][i]
+            points.append({
+                'lat': columns['lat'][i],
+                'lon': columns['lon'][i],
+                'score': None if np.isnan(score) else score,
+                'ring': columns['ring'][i],
+                'reachable_ratio': columns['reachable_ratio'][i],
+                'statistics': {
+                    name: columns[f'stat_{name}'][i] for name in STATISTIC_NAMES
+                } if reachable else None
+            })
+        results['points'] = points
 
         return results
 
@@ -244,36 +490,18 @@ class GridHeatMapGenerator:
         Args:
             results: Results dictionary from generate_heatmap()
         """
-        print(f"\n{'=' * 70}")
-        print("Heat Map Generation Summary")
-        print(f"{'=' * 70}")
-        print(f"\nWork Location: {results['work_location']['lat']:.6f}, {results['work_location']['lon']:.6f}")
-        print(f"Grid Spacing: {results['grid_spacing_feet']} feet")
-        print(f"Rings Analyzed: {results['rings_analyzed']}")
-        print(f"Total Points: {results['total_points']}")
-        print(f"Stopped: {results['stopped_reason']}")
-
-        # Calculate score statistics
-        scores = [p['score'] for p in results['points'] if p['score'] is not None]
-        if scores:
-            print(f"\nScore Distribution (80th percentile travel time):")
-            print(f"  Minimum:  {min(scores):.1f} minutes")
-            print(f"  25th %:   {np.percentile(scores, 25):.1f} minutes")
-            print(f"  Median:   {np.percentile(scores, 50):.1f} minutes")
-            print(f"  75th %:   {np.percentile(scores, 75):.1f} minutes")
-            print(f"  Maximum:  {max(scores):.1f} minutes")
-
-        reachable_points = sum(1 for p in results['points'] if p['score'] is not None)
-        print(f"\nReachability: {reachable_points}/{results['total_points']} points ({reachable_points/results['total_points']*100:.1f}%)")
-
-        print(f"\n{'=' * 70}\n")
+        print_heatmap_summary(results)
 
 
 def main():
     """Test the grid heat map generator."""
     # Load config
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config('config.yaml')
+
+    parser = argparse.ArgumentParser(description='Generate commute heat map')
+    parser.add_argument('--workers', type=int, default=config.get('workers', os.cpu_count()),
+                        help='Departure times routed concurrently (default: CPU count)')
+    args = parser.parse_args()
 
     print("Initializing r5py router...")
 
@@ -284,13 +512,7 @@ def main():
         print("Run: python setup_r5py.py")
         return
 
-    router = R5Router(
-        gtfs_path=config['gtfs_path'],
-        osm_path=str(osm_path),
-        max_walk_time=int(config['max_walk_to_stop'] * 60 / config['walking_speed']),
-        max_trip_duration=config['max_trip_time'],
-        walking_speed=config['walking_speed'] * 1.60934
-    )
+    router = load_router(config, osm_path)
 
     # Geocode work address
     geocoder = Geocoder()
@@ -309,7 +531,8 @@ def main():
         work_lon,
         time_window_start=config['time_window_start'],
         time_window_end=config['time_window_end'],
-        analysis_date=config.get('analysis_date', '2025-11-19')
+        analysis_date=config.get('analysis_date', '2025-11-19'),
+        max_workers=args.workers
     )
 
     # Initialize grid generator
@@ -339,4 +562,5 @@ def main():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
@@ -5,94 +5,312 @@ Uses multiprocessing to analyze multiple grid points simultaneously.
 """
 
 import numpy as np
-import pandas as pd
-import geopandas as gpd
-from shapely.geometry import Point
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
-import json
-import yaml
+import orjson
 from datetime import datetime
+from dataclasses import dataclass
 from tqdm import tqdm
-from multiprocessing import Pool, cpu_count, get_context
+from multiprocessing import cpu_count, get_context
+import logging
 import os
+import sys
+import signal
 
+from config_loader import load_config
 from r5py_router import R5Router
-from analyzer import TimeDistributionAnalyzer
+from router_loader import input_fingerprint
+from analyzer import TimeDistributionAnalyzer, MAX_TRANSIT_SPEED_MPH
+from result_cache import PointResultCache, result_context
+from geo import TO_STATEPLANE
+from grid_generator import _ring_points, print_heatmap_summary
+
+
+@dataclass(frozen=True)
+class WorkerConfig:
+    """Settings every worker process gets once, when the pool starts."""
+    gtfs_path: str
+    osm_path: str
+    max_walk_time: int  # minutes
+    max_trip_duration: int  # minutes
+    walking_speed: float  # km/h
+    time_window_start: str  # HH:MM
+    time_window_end: str  # HH:MM
+    analysis_date: str  # YYYY-MM-DD
+    results_cache_path: Optional[str]
+    data_fingerprint: Optional[str]  # GTFS/OSM fingerprint for cache keys
 
 
 # Global variables for worker processes
 _WORKER_ROUTER = None
 _WORKER_CONFIG = None
+_WORKER_STOP_RING = None
 
+# The work location this worker last served, and its results cache and
+# analyzer; a resident pool runs one heat map at a time, so only the
+# current location's are kept
+_WORKER_LOCATION = None
+_WORKER_CACHE = None
+_WORKER_ANALYZER = None
 
-def _init_worker(config_dict):
+# Modules the Linux fork server imports once for every worker it forks.
+# r5py must not be among them: it starts the JVM on import, and a JVM
+# does not survive fork, so each worker imports it (and starts Java) itself.
+_FORKSERVER_PRELOAD = ['numpy', 'pandas', 'pyproj', 'yaml', 'tqdm']
+
+
+def _pool_context():
+    """
+    Get the multiprocessing context for the worker pool.
+
+    Never 'fork': the parent may already be running a JVM. On Linux the
+    'forkserver' method forks workers from a clean server process that has
+    the heavy Python imports done; elsewhere 'spawn' starts each from scratch.
+    """
+    if sys.platform.startswith('linux'):
+        ctx = get_context('forkserver')
+        ctx.set_forkserver_preload(_FORKSERVER_PRELOAD)
+        return ctx
+    return get_context('spawn')
+
+
+# numpy scores (np.float64) serialize like plain floats
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+
+def _points_log_path(save_path: Path) -> Path:
+    """JSON Lines file that collects points while a heat map is generated."""
+    return save_path.with_suffix('.jsonl')
+
+
+def _open_points_log(save_path: Path):
+    """
+    Open a fresh points log for save_path.
+
+    A log left by an interrupted run is rotated to <name>.jsonl.1 rather
+    than truncated, so the points it holds are not lost.
+
+    Returns:
+        Binary file opened for writing
+    """
+    log_path = _points_log_path(save_path)
+    if log_path.exists():
+        rotated = log_path.with_name(log_path.name + '.1')
+        log_path.replace(rotated)
+        print(f"  Kept points from an earlier interrupted run in {rotated}")
+    return open(log_path, 'wb')
+
+
+def _write_results(save_path: Path, results: Dict):
+    """
+    Write the heat map JSON, streaming its points from the points log.
+
+    Each log line is already one serialized point, so the points are
+    copied into the JSON without being parsed or held in memory.
+
+    Args:
+        save_path: Path of the results JSON
+        results: Results without points (in-memory only keys are skipped)
+    """
+    header = orjson.dumps(
+        {key: value for key, value in results.items() if key != 'scores'},
+        option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2
+    )
+    with open(_points_log_path(save_path), 'rb') as log, open(save_path, 'wb') as f:
+        # Reopen the object to append the points array as its last key
+        f.write(header[:-len(b'\n}')])
+        f.write(b',\n  "points": [')
+        count = 0
+        for line in log:
+            f.write(b',\n    ' if count else b'\n    ')
+            f.write(line.rstrip(b'\n'))
+            count += 1
+        f.write(b'\n  ]\n}' if count else b']\n}')
+
+
+def _drain(results_iter):
+    """Consume the remaining results of a pool.imap() call, ignoring task errors."""
+    while True:
+        try:
+            next(results_iter)
+        except StopIteration:
+            return
+        except Exception:
+            continue
+
+
+def _init_worker(config: WorkerConfig, stop_ring):
     """
     Initialize worker process with r5py router.
 
     This is called once per worker process at startup.
     Building the transport network takes ~1 minute and ~2GB RAM.
+
+    Args:
+        config: Worker settings from ParallelGridHeatMapGenerator.start_pool
+        stop_ring: Shared integer; points in this ring or beyond are skipped
     """
-    global _WORKER_ROUTER, _WORKER_CONFIG
-    _WORKER_CONFIG = config_dict
+    global _WORKER_ROUTER, _WORKER_CONFIG, _WORKER_STOP_RING
+    _WORKER_CONFIG = config
+    _WORKER_STOP_RING = stop_ring
+
+    # Ctrl+C is handled by the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
 
     print(f"Worker {os.getpid()}: Initializing r5py transport network...")
 
     # Build router once per worker (expensive!)
     _WORKER_ROUTER = R5Router(
-        gtfs_path=config_dict['gtfs_path'],
-        osm_path=config_dict['osm_path'],
-        max_walk_time=config_dict['max_walk_time'],
-        max_trip_duration=config_dict['max_trip_duration'],
-        walking_speed=config_dict['walking_speed']
+        gtfs_path=config.gtfs_path,
+        osm_path=config.osm_path,
+        max_walk_time=config.max_walk_time,
+        max_trip_duration=config.max_trip_duration,
+        walking_speed=config.walking_speed
     )
 
     print(f"Worker {os.getpid()}: Ready!")
 
 
-def _analyze_point_worker(point_data):
+def _use_work_location(work_lat: float, work_lon: float):
+    """Switch this worker to a work location, releasing the previous one's cache and analyzer."""
+    global _WORKER_LOCATION, _WORKER_CACHE, _WORKER_ANALYZER
+    if _WORKER_LOCATION == (work_lat, work_lon):
+        return
+
+    if _WORKER_CACHE is not None:
+        _WORKER_CACHE.close()
+    _WORKER_LOCATION = (work_lat, work_lon)
+    _WORKER_CACHE = None
+    _WORKER_ANALYZER = None
+
+
+def _worker_result_cache(work_lat: float, work_lon: float) -> Optional[PointResultCache]:
     """
-    Worker function to analyze a single grid point.
+    Get this worker's on-disk results cache for a work location.
 
-    Reuses the r5py router that was initialized once per worker.
+    Results also depend on the time window, analysis date, router limits
+    and input data; the context is built the same way as the serial
+    generator's.
     """
-    lat, lon, ring = point_data
+    global _WORKER_CACHE
     config = _WORKER_CONFIG
+    if not config.results_cache_path:
+        return None
+
+    _use_work_location(work_lat, work_lon)
+    if _WORKER_CACHE is None:
+        context = result_context(
+            work_lat, work_lon,
+            config.time_window_start,
+            config.time_window_end,
+            config.analysis_date,
+            config.max_walk_time,
+            config.max_trip_duration,
+            config.walking_speed,
+            MAX_TRANSIT_SPEED_MPH,
+            config.data_fingerprint
+        )
+        # Committed after each batch: the file is shared with the other workers
+        _WORKER_CACHE = PointResultCache(config.results_cache_path, context)
+
+    return _WORKER_CACHE
+
+
+def _worker_analyzer(work_lat: float, work_lon: float) -> TimeDistributionAnalyzer:
+    """Get this worker's analyzer for a work location, creating it on first use."""
+    global _WORKER_ANALYZER
+    _use_work_location(work_lat, work_lon)
+    if _WORKER_ANALYZER is None:
+        config = _WORKER_CONFIG
+        # One router call at a time: the pool already runs a worker per core
+        _WORKER_ANALYZER = TimeDistributionAnalyzer(
+            _WORKER_ROUTER,
+            work_lat,
+            work_lon,
+            time_window_start=config.time_window_start,
+            time_window_end=config.time_window_end,
+            analysis_date=config.analysis_date,
+            max_workers=1,
+            max_transit_speed_mph=MAX_TRANSIT_SPEED_MPH
+        )
 
-    # Reuse the router that was built in _init_worker
-    router = _WORKER_ROUTER
-
-    # Initialize analyzer (lightweight - just wraps the router)
-    analyzer = TimeDistributionAnalyzer(
-        router,
-        config['work_lat'],
-        config['work_lon'],
-        time_window_start=config['time_window_start'],
-        time_window_end=config['time_window_end'],
-        analysis_date=config['analysis_date']
-    )
+    return _WORKER_ANALYZER
 
-    # Analyze this point
-    analysis = analyzer.analyze_location(lat, lon, verbose=False)
-    score = analyzer.get_score(analysis)
 
-    return {
-        'lat': lat,
-        'lon': lon,
-        'score': score,
-        'ring': ring,
-        'reachable_ratio': analysis['reachable_ratio'],
-        'statistics': {
-            'min': analysis['statistics'].get('min'),
-            'median': analysis['statistics'].get('median'),
-            'max': analysis['statistics'].get('max'),
-            'mean': analysis['statistics'].get('mean')
-        } if analysis['statistics'] else None
-    }
+def _analyze_points_worker(batch):
+    """
+    Worker function to analyze a batch of grid points.
+
+    Reuses the r5py router that was initialized once per worker. Points not
+    already in the results cache are routed together, sharing each r5py
+    matrix computation. The work location travels with each batch, so one
+    pool can serve heat maps for different work locations.
+
+    Args:
+        batch: Tuple of (points, ring, work_lat, work_lon), where points is
+            a list of (lat, lon)
+
+    Returns:
+        Point results, in the same order as the points
+    """
+    points, ring, work_lat, work_lon = batch
+
+    # The parent stopped the run before this queued ring (or after an error)
+    if ring >= _WORKER_STOP_RING.value:
+        return []
+
+    # Points analyzed before (this run or an earlier one) are not routed again
+    cache = _worker_result_cache(work_lat, work_lon)
+    point_results = [None] * len(points)
+    pending = []
+    for k, (lat, lon) in enumerate(points):
+        cached = cache.get(lat, lon) if cache else None
+        if cached is not None:
+            point_results[k] = dict(cached, ring=ring)
+        else:
+            pending.append(k)
+
+    if not pending:
+        return point_results
+
+    # Analyze the rest with the analyzer (and router) this worker keeps
+    analyzer = _worker_analyzer(work_lat, work_lon)
+    lats = np.array([points[k][0] for k in pending])
+    lons = np.array([points[k][1] for k in pending])
+    analyses = analyzer.analyze_locations(lats, lons, verbose=False)
+
+    for k, analysis in zip(pending, analyses):
+        lat, lon = points[k]
+        point_results[k] = {
+            'lat': lat,
+            'lon': lon,
+            'score': analyzer.get_score(analysis),
+            'ring': ring,
+            'reachable_ratio': analysis['reachable_ratio'],
+            'statistics': {
+                'min': analysis['statistics'].get('min'),
+                'median': analysis['statistics'].get('median'),
+                'max': analysis['statistics'].get('max'),
+                'mean': analysis['statistics'].get('mean')
+            } if analysis['statistics'] else None
+        }
+        if cache:
+            cache.put(lat, lon, point_results[k])
+
+    if cache:
+        cache.commit()
+
+    return point_results
 
 
 class ParallelGridHeatMapGenerator:
-    """Generate heat map using multiprocessing for speed."""
+    """
+    Generate heat map using multiprocessing for speed.
+
+    The worker pool (one r5py transport network per worker) is started on
+    first use and kept until close(), so successive generate_heatmap() calls
+    reuse it. Use the generator as a context manager to shut it down.
+    """
 
     def __init__(
         self,
@@ -101,7 +319,8 @@ class ParallelGridHeatMapGenerator:
         config: Dict,
         grid_spacing_feet: int = 500,
         max_score_threshold: int = 60,
-        num_workers: Optional[int] = None
+        num_workers: Optional[int] = None,
+        results_cache_path: Optional[str] = 'heatmap_cache.db'
     ):
         """
         Initialize parallel grid heat map generator.
@@ -113,6 +332,8 @@ class ParallelGridHeatMapGenerator:
             grid_spacing_feet: Distance between grid points in feet
             max_score_threshold: Stop expanding when all points exceed this score
             num_workers: Number of parallel workers (default: cpu_count())
+            results_cache_path: SQLite file shared by the workers, where each
+                point's result is kept for later runs (None to disable)
         """
         self.work_lat = work_lat
         self.work_lon = work_lon
@@ -120,42 +341,80 @@ class ParallelGridHeatMapGenerator:
         self.grid_spacing_feet = grid_spacing_feet
         self.max_score_threshold = max_score_threshold
         self.num_workers = num_workers or cpu_count()
+        self.results_cache_path = results_cache_path
+        self._pool = None
+        self._stop_ring = None
 
         # Convert work location to state plane coordinates (feet)
         self._init_projections()
 
-    def _init_projections(self):
-        """Initialize coordinate projections."""
-        # Create point in WGS84
-        work_point_wgs84 = Point(self.work_lon, self.work_lat)
-        work_gdf = gpd.GeoDataFrame(
-            {'geometry': [work_point_wgs84]},
-            crs='EPSG:4326'
-        )
+    def __enter__(self):
+        return self
 
-        # Convert to PA State Plane South (feet)
-        work_projected = work_gdf.to_crs('EPSG:2272')
-        self.work_x = work_projected.geometry[0].x
-        self.work_y = work_projected.geometry[0].y
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    def _grid_to_latlon(self, x: float, y: float) -> Tuple[float, float]:
+    def start_pool(self):
         """
-        Convert grid coordinates (PA State Plane feet) to lat/lon.
+        Start the worker pool if it is not already running.
 
-        Args:
-            x: X coordinate in feet
-            y: Y coordinate in feet
+        Each worker builds its own r5py transport network (~1 minute).
 
         Returns:
-            Tuple of (latitude, longitude)
+            The running pool
         """
-        point = Point(x, y)
-        gdf = gpd.GeoDataFrame(
-            {'geometry': [point]},
-            crs='EPSG:2272'
-        )
-        gdf_wgs84 = gdf.to_crs('EPSG:4326')
-        return gdf_wgs84.geometry[0].y, gdf_wgs84.geometry[0].x
+        if self._pool is None:
+            worker_config = WorkerConfig(
+                gtfs_path=self.config['gtfs_path'],
+                osm_path=self.config['osm_path'],
+                max_walk_time=self.config['max_walk_time'],
+                max_trip_duration=self.config['max_trip_duration'],
+                walking_speed=self.config['walking_speed'],
+                time_window_start=self.config['time_window_start'],
+                time_window_end=self.config['time_window_end'],
+                analysis_date=self.config['analysis_date'],
+                results_cache_path=self.results_cache_path,
+                # Cached results are invalidated when the GTFS or OSM data changes
+                data_fingerprint=input_fingerprint(
+                    self.config['gtfs_path'], self.config['osm_path']
+                ) if self.results_cache_path else None
+            )
+
+            # Workers never inherit a JVM: see _pool_context
+            ctx = _pool_context()
+            self._stop_ring = ctx.Value('i', 0, lock=False)
+            self._pool = ctx.Pool(
+                processes=self.num_workers,
+                initializer=_init_worker,
+                initargs=(worker_config, self._stop_ring)
+            )
+
+        return self._pool
+
+    def close(self):
+        """Shut down the worker pool, if running."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._stop_ring = None
+
+    def set_work_location(self, work_lat: float, work_lon: float):
+        """
+        Point the generator at a new work location, keeping the worker pool.
+
+        Args:
+            work_lat: Work location latitude
+            work_lon: Work location longitude
+        """
+        self.work_lat = work_lat
+        self.work_lon = work_lon
+        self._init_projections()
+
+    def _init_projections(self):
+        """Initialize coordinate projections."""
+        # Work location in PA State Plane South (feet)
+        self.work_x, self.work_y = TO_STATEPLANE.transform(self.work_lon, self.work_lat)
 
     def generate_ring_points(self, ring_number: int) -> List[Tuple[float, float]]:
         """
@@ -174,20 +433,30 @@ class ParallelGridHeatMapGenerator:
         if ring_number == 0:
             return [(self.work_lat, self.work_lon)]
 
-        points = []
-        spacing = self.grid_spacing_feet
+        lats, lons = _ring_points(
+            self.work_x, self.work_y, self.grid_spacing_feet, ring_number
+        )
+        return list(zip(lats.tolist(), lons.tolist()))
+
+    def _submit_ring(self, pool, ring: int):
+        """
+        Queue a ring's points on the pool without waiting for them.
+
+        Returns:
+            Tuple of (number of points, iterator over lists of point results
+            in order)
+        """
+        points = self.generate_ring_points(ring)
 
-        # Generate points along the ring
-        for i in range(-ring_number, ring_number + 1):
-            for j in range(-ring_number, ring_number + 1):
-                # Only include points on the perimeter of the ring
-                if abs(i) == ring_number or abs(j) == ring_number:
-                    x = self.work_x + (i * spacing)
-                    y = self.work_y + (j * spacing)
-                    lat, lon = self._grid_to_latlon(x, y)
-                    points.append((lat, lon))
+        # About two batches per worker: each batch is one task and shares its
+        # r5py computations, while the workers still balance the ring's load
+        batch_size = -(-len(points) // (self.num_workers * 2))
+        batches = [
+            (points[start:start + batch_size], ring, self.work_lat, self.work_lon)
+            for start in range(0, len(points), batch_size)
+        ]
 
-        return points
+        return len(points), pool.imap(_analyze_points_worker, batches)
 
     def generate_heatmap(
         self,
@@ -200,11 +469,17 @@ class ParallelGridHeatMapGenerator:
 
         Args:
             max_rings: Maximum number of rings to analyze
-            save_path: Path to save results JSON (optional)
+            save_path: Path to save results JSON (optional). Points are
+                appended to a .jsonl file next to it as each ring finishes,
+                so an interrupted run keeps what it analyzed, and are
+                streamed from there into the JSON; the .jsonl is removed
+                once the JSON is written.
             verbose: Show progress
 
         Returns:
-            Dictionary with heat map data
+            Dictionary with heat map data. With save_path the points are
+            only written to the file; the dictionary carries their
+            reachable 'scores' instead.
         """
         results = {
             'work_location': {
@@ -228,52 +503,87 @@ class ParallelGridHeatMapGenerator:
         print(f"  Max rings: {max_rings}")
         print()
 
-        # Prepare config for workers
-        worker_config = {
-            'gtfs_path': self.config['gtfs_path'],
-            'osm_path': self.config['osm_path'],
-            'max_walk_time': self.config['max_walk_time'],
-            'max_trip_duration': self.config['max_trip_duration'],
-            'walking_speed': self.config['walking_speed'],
-            'work_lat': self.work_lat,
-            'work_lon': self.work_lon,
-            'time_window_start': self.config['time_window_start'],
-            'time_window_end': self.config['time_window_end'],
-            'analysis_date': self.config['analysis_date']
-        }
+        points_log = None
+        if save_path:
+            save_path = Path(save_path)
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            points_log = _open_points_log(save_path)
+            del results['points']
+            results['scores'] = []
 
-        # Create process pool using 'spawn' method (not 'fork')
-        # This is required for r5py/JPype to work in multiprocessing
-        # 'spawn' starts fresh Python process, avoiding Java VM fork issues
-        ctx = get_context('spawn')
-        with ctx.Pool(processes=self.num_workers, initializer=_init_worker, initargs=(worker_config,)) as pool:
-            for ring in range(max_rings + 1):
-                ring_points = self.generate_ring_points(ring)
+        try:
+            self._run_rings(results, max_rings, points_log, verbose)
+        finally:
+            if points_log:
+                points_log.close()
 
-                if verbose:
-                    print(f"\nRing {ring}: {len(ring_points)} points (analyzing in parallel with {self.num_workers} workers)")
+        # Save results if path provided
+        if save_path:
+            _write_results(save_path, results)
+            _points_log_path(save_path).unlink()
+            print(f"\n✓ Saved heat map data to {save_path}")
+
+        return results
 
-                # Prepare point data for workers
-                point_data = [(lat, lon, ring) for lat, lon in ring_points]
+    def _run_rings(self, results: Dict, max_rings: int, points_log, verbose: bool):
+        """
+        Analyze rings until the stopping condition, filling in results.
+
+        Args:
+            results: Results dictionary from generate_heatmap(), updated in place
+            max_rings: Maximum number of rings to analyze
+            points_log: Binary file each ring's points are appended to
+                instead of results['points'], or None
+            verbose: Show progress
+        """
+        # Reuses the pool from earlier calls, if any
+        pool = self.start_pool()
+        self._stop_ring.value = max_rings + 1
+
+        ring_iter = next_ring = None
+        try:
+            next_ring = self._submit_ring(pool, 0)
+
+            for ring in range(max_rings + 1):
+                num_points, ring_iter = next_ring
+
+                # Queue the next ring behind this one, so workers that finish
+                # early start on it instead of idling while the slowest points
+                # of this ring complete. It is skipped if this ring stops the
+                # run.
+                next_ring = self._submit_ring(pool, ring + 1) if ring < max_rings else None
 
-                # Analyze points in parallel
                 if verbose:
-                    # Use imap_unordered with tqdm for progress
-                    ring_results = list(tqdm(
-                        pool.imap_unordered(_analyze_point_worker, point_data),
-                        total=len(point_data),
-                        desc=f"  Analyzing"
-                    ))
-                else:
-                    ring_results = pool.map(_analyze_point_worker, point_data)
+                    print(f"\nRing {ring}: {num_points} points (analyzing in parallel with {self.num_workers} workers)")
+
+                # Analyze points in parallel; the progress bar is updated by
+                # hand and throttled to a few refreshes per second
+                ring_results = []
+                with tqdm(
+                    total=num_points,
+                    desc="  Analyzing",
+                    miniters=1,
+                    mininterval=0.5,
+                    disable=not verbose
+                ) as progress:
+                    for batch_results in ring_iter:
+                        ring_results.extend(batch_results)
+                        progress.update(len(batch_results))
+
+                # Reachable scores, for the summary and the stopping condition
+                ring_scores = [r['score'] for r in ring_results if r['score'] is not None]
 
                 # Add results
-                results['points'].extend(ring_results)
+                if points_log:
+                    points_log.write(b''.join(
+                        orjson.dumps(point, option=_ORJSON_OPTIONS) + b'\n' for point in ring_results
+                    ))
+                    points_log.flush()
+                    results['scores'].extend(ring_scores)
+                else:
+                    results['points'].extend(ring_results)
                 results['rings_analyzed'] = ring + 1
-                results['total_points'] = len(results['points'])
-
-                # Check stopping condition
-                ring_scores = [r['score'] for r in ring_results if r['score'] is not None]
+                results['total_points'] += len(ring_results)
 
                 if ring_scores:
                     min_score = min(ring_scores)
@@ -298,43 +608,42 @@ class ParallelGridHeatMapGenerator:
                     results['stopped_reason'] = f'Reached maximum rings ({max_rings})'
                     if verbose:
                         print(f"\n✓ Stopping: Reached maximum rings ({max_rings})")
-
-        # Save results if path provided
-        if save_path:
-            save_path = Path(save_path)
-            save_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(save_path, 'w') as f:
-                json.dump(results, f, indent=2)
-            print(f"\n✓ Saved heat map data to {save_path}")
-
-        return results
+        finally:
+            # Workers skip every task still queued (the speculative next
+            # ring, or the rest of this one if it raised); wait for those
+            # now-instant tasks so none is left on the pool for the next run
+            self._stop_ring.value = 0
+            if ring_iter is not None:
+                _drain(ring_iter)
+            if next_ring is not None:
+                _drain(next_ring[1])
 
     def print_summary(self, results: Dict):
         """Print summary of heat map generation."""
-        print(f"\n{'=' * 70}")
-        print("Heat Map Generation Summary")
-        print(f"{'=' * 70}")
-        print(f"\nWork Location: {results['work_location']['lat']:.6f}, {results['work_location']['lon']:.6f}")
-        print(f"Grid Spacing: {results['grid_spacing_feet']} feet")
-        print(f"Parallel Workers: {results['num_workers']}")
-        print(f"Rings Analyzed: {results['rings_analyzed']}")
-        print(f"Total Points: {results['total_points']}")
-        print(f"Stopped: {results['stopped_reason']}")
-
-        # Calculate score statistics
-        scores = [p['score'] for p in results['points'] if p['score'] is not None]
-        if scores:
-            print(f"\nScore Distribution (80th percentile travel time):")
-            print(f"  Minimum:  {min(scores):.1f} minutes")
-            print(f"  25th %:   {np.percentile(scores, 25):.1f} minutes")
-            print(f"  Median:   {np.percentile(scores, 50):.1f} minutes")
-            print(f"  75th %:   {np.percentile(scores, 75):.1f} minutes")
-            print(f"  Maximum:  {max(scores):.1f} minutes")
-
-        reachable_points = sum(1 for p in results['points'] if p['score'] is not None)
-        print(f"\nReachability: {reachable_points}/{results['total_points']} points ({reachable_points/results['total_points']*100:.1f}%)")
-
-        print(f"\n{'=' * 70}\n")
+        print_heatmap_summary(results)
+
+
+def build_generator_config(config: Dict, osm_path: Path) -> Dict:
+    """
+    Convert config.yaml settings into the generator's worker settings.
+
+    Args:
+        config: Parsed config.yaml (walking speed in mph, distances in miles)
+        osm_path: Path to OSM PBF file
+
+    Returns:
+        Configuration dictionary for ParallelGridHeatMapGenerator
+    """
+    return {
+        'gtfs_path': config['gtfs_path'],
+        'osm_path': str(osm_path),
+        'max_walk_time': int(config['max_walk_to_stop'] * 60 / config['walking_speed']),
+        'max_trip_duration': config['max_trip_time'],
+        'walking_speed': config['walking_speed'] * 1.60934,
+        'time_window_start': config['time_window_start'],
+        'time_window_end': config['time_window_end'],
+        'analysis_date': config.get('analysis_date', '2025-11-19')
+    }
 
 
 def main():
@@ -342,8 +651,7 @@ def main():
     from geocoder import Geocoder
 
     # Load config
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config('config.yaml')
 
     print("Initializing parallel heat map generator...")
 
@@ -365,16 +673,7 @@ def main():
     print(f"Work location: {work_lat:.6f}, {work_lon:.6f}")
 
     # Prepare config for generator
-    generator_config = {
-        'gtfs_path': config['gtfs_path'],
-        'osm_path': str(osm_path),
-        'max_walk_time': int(config['max_walk_to_stop'] * 60 / config['walking_speed']),
-        'max_trip_duration': config['max_trip_time'],
-        'walking_speed': config['walking_speed'] * 1.60934,
-        'time_window_start': config['time_window_start'],
-        'time_window_end': config['time_window_end'],
-        'analysis_date': config.get('analysis_date', '2025-11-19')
-    }
+    generator_config = build_generator_config(config, osm_path)
 
     # Determine number of workers
     num_cpus = cpu_count()
@@ -400,19 +699,21 @@ def main():
     print("Then analysis proceeds in parallel - much faster!")
     print("\nTesting with 3 rings first...")
 
-    results = generator.generate_heatmap(
-        max_rings=3,
-        save_path='heatmap_data.json',
-        verbose=True
-    )
+    with generator:
+        results = generator.generate_heatmap(
+            max_rings=3,
+            save_path='heatmap_data.json',
+            verbose=True
+        )
 
     generator.print_summary(results)
 
     print("\nSpeedup estimate:")
-    print(f"  Sequential: ~{len(results['points']) * 2.5:.0f} minutes")
-    print(f"  Parallel ({num_workers} workers): ~{len(results['points']) * 2.5 / num_workers:.0f} minutes")
+    print(f"  Sequential: ~{results['total_points'] * 2.5:.0f} minutes")
+    print(f"  Parallel ({num_workers} workers): ~{results['total_points'] * 2.5 / num_workers:.0f} minutes")
     print(f"  Speedup: ~{num_workers:.1f}x faster")
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
@@ -5,15 +5,81 @@ Loads Pittsburgh Regional Transit GTFS data and provides
 spatial indexing for efficient stop lookups.
 """
 
+import logging
 import pandas as pd
 import geopandas as gpd
-from shapely.geometry import Point
-from rtree import index
+import shapely
 import numpy as np
+from scipy.spatial import cKDTree
 from typing import Tuple, List, Dict
 from pathlib import Path
+import csv
+import io
 import zipfile
 
+from geo import EARTH_RADIUS_MILES, TO_STATEPLANE, haversine_miles, unit_xyz
+
+
+logger = logging.getLogger(__name__)
+
+# Columns read from each GTFS file and their dtypes. IDs are read as
+# strings in every file so that they compare equal across tables.
+_DAY_COLUMNS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+GTFS_COLUMNS = {
+    'stops.txt': {
+        'stop_id': str, 'stop_name': str, 'stop_lat': 'float64', 'stop_lon': 'float64'
+    },
+    'routes.txt': {
+        'route_id': str, 'route_short_name': str, 'route_long_name': str
+    },
+    'trips.txt': {
+        'trip_id': str, 'route_id': str, 'service_id': str
+    },
+    'stop_times.txt': {
+        'trip_id': str, 'arrival_time': str, 'departure_time': str,
+        'stop_id': str, 'stop_sequence': 'int32'
+    },
+    'calendar.txt': {
+        'service_id': str, **{day: 'int8' for day in _DAY_COLUMNS},
+        'start_date': str, 'end_date': str
+    },
+}
+
+# Columns a valid feed may leave out; they are read as empty strings
+_OPTIONAL_COLUMNS = {'stop_name', 'route_short_name', 'route_long_name'}
+
+# ID columns that link tables, and the tables holding them. Each becomes one
+# categorical dtype shared by those tables, so merges, equality and isin
+# filters work on integer codes instead of strings.
+_SHARED_ID_TABLES = {
+    'stop_id': ('stops', 'stop_times'),
+    'trip_id': ('trips', 'stop_times'),
+    'route_id': ('routes', 'trips'),
+    'service_id': ('trips', 'calendar'),
+}
+
+# Seconds value for a missing or malformed GTFS time
+MISSING_TIME = -1
+
+
+def gtfs_time_to_seconds(times: pd.Series) -> np.ndarray:
+    """
+    Convert GTFS time strings to seconds since midnight.
+
+    GTFS times can be > 24:00:00 for trips past midnight. Missing or
+    malformed times (e.g. stops between timepoints) become MISSING_TIME.
+
+    Args:
+        times: Time strings like "08:30:00" or "25:30:00"
+
+    Returns:
+        int32 array of seconds since midnight
+    """
+    parts = times.str.split(':', n=2, expand=True).reindex(columns=range(3))
+    hms = parts.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    seconds = hms @ np.array([3600, 60, 1])
+    return np.nan_to_num(seconds, nan=MISSING_TIME).astype(np.int32)
+
 
 class GTFSLoader:
     """Load and query GTFS transit data."""
@@ -32,23 +98,31 @@ class GTFSLoader:
         self.stop_times = None
         self.calendar = None
         self.stops_gdf = None
-        self.spatial_index = None
+        self._stops_tree = None
+        self._stop_to_routes = None
+        self._stop_to_route_ids = None
+        self._weekday_service_ids = None
 
     def load(self) -> None:
         """Load GTFS data from zip file."""
-        print(f"Loading GTFS data from {self.gtfs_path}...")
+        logger.info("Loading GTFS data from %s", self.gtfs_path)
 
         # Read GTFS files from zip
         with zipfile.ZipFile(self.gtfs_path, 'r') as zf:
-            self.stops = pd.read_csv(zf.open('stops.txt'))
-            self.routes = pd.read_csv(zf.open('routes.txt'))
-            self.trips = pd.read_csv(zf.open('trips.txt'))
-            self.stop_times = pd.read_csv(zf.open('stop_times.txt'))
-            self.calendar = pd.read_csv(zf.open('calendar.txt'))
+            self.stops = self._read_table(zf, 'stops.txt')
+            self.routes = self._read_table(zf, 'routes.txt')
+            self.trips = self._read_table(zf, 'trips.txt')
+            self.stop_times = self._read_table(zf, 'stop_times.txt')
+            self.calendar = self._read_table(zf, 'calendar.txt')
+
+        self._categorize_ids()
+
+        # Integer times, parsed once so routing compares numbers, not strings
+        self.stop_times['arrival_seconds'] = gtfs_time_to_seconds(self.stop_times['arrival_time'])
+        self.stop_times['departure_seconds'] = gtfs_time_to_seconds(self.stop_times['departure_time'])
 
-        print(f"  ✓ Loaded {len(self.routes)} routes")
-        print(f"  ✓ Loaded {len(self.stops)} stops")
-        print(f"  ✓ Loaded {len(self.trips)} trips")
+        logger.info("Loaded %d routes, %d stops, %d trips",
+                    len(self.routes), len(self.stops), len(self.trips))
 
         # Create GeoDataFrame of stops
         self._create_stops_geodataframe()
@@ -56,37 +130,68 @@ class GTFSLoader:
         # Build spatial index
         self._build_spatial_index()
 
+    @staticmethod
+    def _read_table(zf: zipfile.ZipFile, name: str) -> pd.DataFrame:
+        """
+        Read the columns we use from one GTFS file.
+
+        The pyarrow engine parses with multiple threads; unused columns
+        (stop_times headsigns, shape distances, ...) are never converted.
+        Optional columns the file omits are added as empty strings.
+
+        Raises:
+            ValueError: If the file lacks a required column
+        """
+        columns = GTFS_COLUMNS[name]
+        with zf.open(name) as f:
+            header = next(csv.reader(io.TextIOWrapper(f, encoding='utf-8-sig')), [])
+        header = {column.strip() for column in header}
+
+        missing = [column for column in columns if column not in header]
+        required = [column for column in missing if column not in _OPTIONAL_COLUMNS]
+        if required:
+            raise ValueError(f"{name} is missing required columns: {', '.join(required)}")
+
+        present = {column: dtype for column, dtype in columns.items() if column in header}
+        with zf.open(name) as f:
+            table = pd.read_csv(f, engine='pyarrow', usecols=list(present), dtype=present)
+        for column in missing:
+            table[column] = ''
+        return table
+
+    def _categorize_ids(self) -> None:
+        """Convert linking ID columns to categoricals shared across tables."""
+        for column, table_names in _SHARED_ID_TABLES.items():
+            tables = [getattr(self, name) for name in table_names]
+            values = pd.concat([table[column] for table in tables], ignore_index=True)
+            dtype = pd.CategoricalDtype(values.dropna().unique())
+            for table in tables:
+                table[column] = table[column].astype(dtype)
+
     def _create_stops_geodataframe(self) -> None:
         """Convert stops to GeoDataFrame with Point geometries."""
-        stops = self.stops.copy()
-
-        # Create Point geometries from lat/lon
-        geometry = [Point(lon, lat) for lon, lat in
-                   zip(stops['stop_lon'], stops['stop_lat'])]
+        # Project to state plane for accurate distance calculations,
+        # all stops in one transform and one geometry array
+        x, y = TO_STATEPLANE.transform(
+            self.stops['stop_lon'].to_numpy(), self.stops['stop_lat'].to_numpy()
+        )
 
         self.stops_gdf = gpd.GeoDataFrame(
-            stops,
-            geometry=geometry,
-            crs='EPSG:4326'  # WGS84 lat/lon
+            self.stops.copy(),
+            geometry=shapely.points(x, y),
+            crs='EPSG:2272'
         )
 
-        # Project to state plane for accurate distance calculations
-        # Pennsylvania South State Plane (EPSG:2272) - feet
-        self.stops_gdf = self.stops_gdf.to_crs('EPSG:2272')
-
-        print(f"  ✓ Created spatial index for {len(self.stops_gdf)} stops")
-
     def _build_spatial_index(self) -> None:
-        """Build R-tree spatial index for fast stop lookups."""
-        self.spatial_index = index.Index()
-
-        for idx, stop in self.stops_gdf.iterrows():
-            # Insert stop bounds into spatial index
-            self.spatial_index.insert(
-                idx,
-                stop.geometry.bounds,
-                obj=stop['stop_id']
-            )
+        """Build a k-d tree over stop positions on the unit sphere."""
+        # Sliding-midpoint splits build without a median search per node;
+        # queries on a few thousand stops are just as fast
+        self._stops_tree = cKDTree(
+            unit_xyz(self.stops['stop_lat'].to_numpy(), self.stops['stop_lon'].to_numpy()),
+            balanced_tree=False
+        )
+
+        logger.info("Created spatial index for %d stops", len(self.stops))
 
     def find_stops_within_radius(
         self,
@@ -105,72 +210,85 @@ class GTFSLoader:
         Returns:
             GeoDataFrame of stops within radius with distances
         """
-        # Create point in same CRS as stops (state plane feet)
-        point_wgs84 = Point(lon, lat)
-        point_gdf = gpd.GeoDataFrame(
-            {'geometry': [point_wgs84]},
-            crs='EPSG:4326'
+        # Great-circle radius as a straight-line chord through the unit sphere
+        chord = 2 * np.sin(radius_miles / EARTH_RADIUS_MILES / 2)
+        idx = np.asarray(
+            self._stops_tree.query_ball_point(unit_xyz(lat, lon), chord, return_sorted=False),
+            dtype=np.intp
         )
-        point_projected = point_gdf.to_crs('EPSG:2272').geometry[0]
 
-        # Convert radius to feet (state plane is in feet)
-        radius_feet = radius_miles * 5280
-
-        # Create search bounds
-        minx = point_projected.x - radius_feet
-        miny = point_projected.y - radius_feet
-        maxx = point_projected.x + radius_feet
-        maxy = point_projected.y + radius_feet
-
-        # Query spatial index for candidates
-        candidate_indices = list(self.spatial_index.intersection(
-            (minx, miny, maxx, maxy)
-        ))
-
-        if not candidate_indices:
+        if len(idx) == 0:
             return gpd.GeoDataFrame()
 
-        # Get candidate stops
-        candidates = self.stops_gdf.loc[candidate_indices].copy()
-
-        # Calculate exact distances
-        candidates['distance_miles'] = candidates.geometry.distance(
-            point_projected
-        ) / 5280  # convert feet to miles
-
-        # Filter to exact radius
-        nearby_stops = candidates[
-            candidates['distance_miles'] <= radius_miles
-        ].sort_values('distance_miles')
+        # Exact great-circle distances for the matches only, sorted in numpy
+        # so the GeoDataFrame is indexed once
+        distance_miles = haversine_miles(
+            lat, lon, self.stops['stop_lat'].to_numpy()[idx], self.stops['stop_lon'].to_numpy()[idx]
+        )
+        order = np.argsort(distance_miles, kind='stable')
 
+        nearby_stops = self.stops_gdf.take(idx[order])
+        nearby_stops['distance_miles'] = distance_miles[order]
         return nearby_stops
 
     def get_routes_for_stop(self, stop_id: str) -> pd.DataFrame:
         """
         Get all routes that serve a stop.
 
+        Builds the stop→routes index on first use.
+
         Args:
             stop_id: Stop ID
 
         Returns:
             DataFrame of routes serving this stop
         """
-        # Get all trips that visit this stop
-        stop_times_for_stop = self.stop_times[
-            self.stop_times['stop_id'] == stop_id
-        ]
+        if self._stop_to_route_ids is None:
+            self.build_stop_to_routes_index()
+        route_ids = self._stop_to_route_ids.get(str(stop_id), [])
+
+        return self.routes[self.routes['route_id'].isin(route_ids)]
+
+    def build_stop_to_routes_index(self) -> None:
+        """Map every stop to the IDs and short names of the routes serving it, in one merge."""
+        stop_trips = self.stop_times[['stop_id', 'trip_id']].drop_duplicates()
+        routes = self.routes[['route_id', 'route_short_name']].assign(
+            route_order=np.arange(len(self.routes))
+        )
+
+        stop_routes = (
+            stop_trips
+            .merge(self.trips[['trip_id', 'route_id']], on='trip_id')
+            .merge(routes, on='route_id')
+            .drop_duplicates(['stop_id', 'route_id'])
+            .sort_values('route_order')
+        )
+
+        by_stop = stop_routes.groupby('stop_id', sort=False, observed=True)
+        self._stop_to_route_ids = {
+            stop_id: route_ids.to_numpy()
+            for stop_id, route_ids in by_stop['route_id']
+        }
+        self._stop_to_routes = {
+            stop_id: names.astype(str).tolist()
+            for stop_id, names in by_stop['route_short_name']
+        }
 
-        trip_ids = stop_times_for_stop['trip_id'].unique()
+    def route_names_for_stop(self, stop_id: str) -> List[str]:
+        """
+        Get short names of the routes that serve a stop.
 
-        # Get routes for these trips
-        trips_for_stop = self.trips[self.trips['trip_id'].isin(trip_ids)]
-        route_ids = trips_for_stop['route_id'].unique()
+        Builds the stop→routes index on first use.
 
-        routes_for_stop = self.routes[
-            self.routes['route_id'].isin(route_ids)
-        ]
+        Args:
+            stop_id: Stop ID
 
-        return routes_for_stop
+        Returns:
+            Route short names, in routes.txt order
+        """
+        if self._stop_to_routes is None:
+            self.build_stop_to_routes_index()
+        return self._stop_to_routes.get(str(stop_id), [])
 
     def get_stop_info(self, stop_id: str) -> Dict:
         """
@@ -182,6 +300,8 @@ class GTFSLoader:
         Returns:
             Dictionary with stop information
         """
+        # IDs are read as strings, so numeric IDs from callers must match them
+        stop_id = str(stop_id)
         stop = self.stops[self.stops['stop_id'] == stop_id].iloc[0]
         routes = self.get_routes_for_stop(stop_id)
 
@@ -197,28 +317,27 @@ class GTFSLoader:
         """
         Get service IDs for typical weekdays.
 
+        Computed on first use; later calls return the same list.
+
         Returns:
             List of service IDs that run on weekdays
         """
-        # Find services that run Monday-Friday
-        weekday_services = self.calendar[
-            (self.calendar['monday'] == 1) &
-            (self.calendar['tuesday'] == 1) &
-            (self.calendar['wednesday'] == 1) &
-            (self.calendar['thursday'] == 1) &
-            (self.calendar['friday'] == 1)
-        ]
+        if self._weekday_service_ids is None:
+            # Services that run Monday-Friday
+            runs = self.calendar[list(_DAY_COLUMNS[:5])].to_numpy() == 1
+            self._weekday_service_ids = (
+                self.calendar['service_id'][runs.all(axis=1)].tolist()
+            )
 
-        return weekday_services['service_id'].tolist()
+        return self._weekday_service_ids
 
 
 def main():
     """Test the GTFS loader."""
-    import yaml
+    from config_loader import load_config
 
     # Load config
-    with open('config.example.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config('config.example.yaml')
 
     # Initialize loader
     loader = GTFSLoader(config['gtfs_path'])
@@ -235,15 +354,15 @@ def main():
 
     print(f"\nFound {len(nearby_stops)} stops:\n")
 
-    for idx, stop in nearby_stops.head(10).iterrows():
-        routes = loader.get_routes_for_stop(stop['stop_id'])
-        route_names = ', '.join(routes['route_short_name'].astype(str).tolist())
+    for stop in nearby_stops.head(10).itertuples(index=False):
+        route_names = ', '.join(loader.route_names_for_stop(stop.stop_id))
 
-        print(f"  • {stop['stop_name']}")
-        print(f"    Distance: {stop['distance_miles']:.2f} miles")
+        print(f"  • {stop.stop_name}")
+        print(f"    Distance: {stop.distance_miles:.2f} miles")
         print(f"    Routes: {route_names}")
         print()
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Resident heat map server.
+
+Keeps a ParallelGridHeatMapGenerator and its worker pool alive so the
+r5py transport networks (~1 minute per worker to build) are paid for once,
+then runs heat map jobs sent over a Unix socket.
+
+Each job is one line of JSON; the reply is one line of JSON:
+
+    {"work_lat": 40.4435, "work_lon": -79.9455, "max_rings": 5,
+     "save_path": "heatmap_data.json"}
+
+save_path must name a .json file inside the server's --output-dir.
+
+Usage:
+    python src/heatmap_server.py --socket /tmp/bustowork.sock
+    echo '{"work_lat": 40.4435, "work_lon": -79.9455}' | nc -U /tmp/bustowork.sock
+"""
+
+import argparse
+import json
+import logging
+import os
+import socketserver
+from multiprocessing import cpu_count
+from pathlib import Path
+
+from config_loader import load_config
+from grid_generator_parallel import ParallelGridHeatMapGenerator, build_generator_config
+
+
+def resolve_save_path(output_dir: Path, save_path: str) -> Path:
+    """
+    Resolve a client-supplied save path inside the output directory.
+
+    Args:
+        output_dir: Directory heat maps may be written to
+        save_path: Relative path from the job
+
+    Returns:
+        Absolute path of the .json file to write
+
+    Raises:
+        ValueError: If the path is not a .json file inside output_dir
+    """
+    output_dir = output_dir.resolve()
+    path = (output_dir / save_path).resolve()
+    if output_dir not in path.parents:
+        raise ValueError(f'save_path must be inside {output_dir}')
+    if path.suffix != '.json':
+        raise ValueError('save_path must be a .json file')
+    return path
+
+
+class HeatMapJobHandler(socketserver.StreamRequestHandler):
+    """Run one heat map job per connection."""
+
+    def handle(self):
+        generator = self.server.generator
+
+        try:
+            job = json.loads(self.rfile.readline())
+            save_path = job.get('save_path')
+            if save_path is not None:
+                save_path = resolve_save_path(self.server.output_dir, str(save_path))
+
+            generator.set_work_location(float(job['work_lat']), float(job['work_lon']))
+            results = generator.generate_heatmap(
+                max_rings=int(job.get('max_rings', 3)),
+                save_path=save_path,
+                verbose=True
+            )
+            reply = {
+                'total_points': results['total_points'],
+                'rings_analyzed': results['rings_analyzed'],
+                'stopped_reason': results['stopped_reason'],
+                'save_path': str(save_path) if save_path else None
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            reply = {'error': f'Invalid job: {e}'}
+
+        self.wfile.write(json.dumps(reply).encode() + b'\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve heat map jobs from a resident worker pool'
+    )
+    parser.add_argument(
+        '--socket',
+        default='/tmp/bustowork.sock',
+        help='Unix socket path (default: /tmp/bustowork.sock)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=min(int(cpu_count() * 0.75), 16),
+        help='Number of worker processes (default: 75%% of CPUs, at most 16)'
+    )
+    parser.add_argument(
+        '--config',
+        default='config.yaml',
+        help='Path to config file (default: config.yaml)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default='.',
+        help='Directory job save paths are resolved in (default: current directory)'
+    )
+
+    args = parser.parse_args()
+
+    # Load config
+    config = load_config(args.config)
+
+    osm_path = Path("data/pennsylvania.osm.pbf")
+    if not osm_path.exists():
+        print(f"Error: OSM data not found at {osm_path}")
+        print("Run: python setup_r5py.py")
+        return
+
+    # Work location is set per job
+    generator = ParallelGridHeatMapGenerator(
+        0.0,
+        0.0,
+        build_generator_config(config, osm_path),
+        grid_spacing_feet=config['grid_spacing'],
+        max_score_threshold=config['max_time_threshold'],
+        num_workers=args.workers
+    )
+
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+
+    with generator:
+        print(f"Starting {args.workers} workers (building r5py networks)...")
+        generator.start_pool()
+
+        with socketserver.UnixStreamServer(args.socket, HeatMapJobHandler) as server:
+            server.generator = generator
+            server.output_dir = Path(args.output_dir)
+            print(f"Listening on {args.socket} (Ctrl+C to stop)")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                print("\nShutting down...")
+            finally:
+                os.unlink(args.socket)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    main()
@@ -5,13 +5,21 @@ r5py is a Python wrapper for R5 (Rapid Realistic Routing on Real-world and
 Reimagined networks), designed for efficient GTFS-based routing analysis.
 """
 
+import logging
 import r5py
 import geopandas as gpd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Sequence
 from pathlib import Path
-import yaml
+from tqdm import tqdm
+
+from config_loader import load_config
+
+
+logger = logging.getLogger(__name__)
 
 
 class R5Router:
@@ -41,17 +49,17 @@ class R5Router:
         self.max_trip_duration = max_trip_duration
         self.walking_speed = walking_speed
 
-        print(f"Initializing r5py transport network...")
-        print(f"  GTFS: {self.gtfs_path}")
-        print(f"  OSM: {self.osm_path}")
+        logger.info("Initializing r5py transport network (GTFS: %s, OSM: %s)",
+                    self.gtfs_path, self.osm_path)
 
-        # Build transport network
+        # Build transport network; r5py reloads it from its own on-disk
+        # cache when the inputs are unchanged (see clear_r5py_cache.py)
         self.transport_network = r5py.TransportNetwork(
             osm_pbf=str(self.osm_path),
             gtfs=[str(self.gtfs_path)]
         )
 
-        print(f"  ✓ Transport network ready")
+        logger.info("Transport network ready")
 
     def calculate_travel_times(
         self,
@@ -91,6 +99,61 @@ class R5Router:
 
         return results
 
+    def calculate_travel_times_window(
+        self,
+        origins: gpd.GeoDataFrame,
+        destinations: gpd.GeoDataFrame,
+        departure_time: datetime,
+        window_minutes: int,
+        percentiles: Sequence[int] = (50,),
+        transport_modes: List[r5py.TransportMode] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate travel times for every departure minute in a time window.
+
+        R5 routes the whole window in one range-RAPTOR search instead of
+        one search per departure, and reports percentiles of the travel
+        times across the window.
+
+        Args:
+            origins: GeoDataFrame with origin points (must have 'id' column)
+            destinations: GeoDataFrame with destination points (must have 'id' column)
+            departure_time: Start of the departure window
+            window_minutes: Length of the departure window in minutes
+            percentiles: Percentiles of travel time across the window
+            transport_modes: List of transport modes (default: WALK + TRANSIT)
+
+        Returns:
+            DataFrame with columns: from_id, to_id, travel_time (the median
+            requested percentile), plus travel_time_p{N} for each percentile
+            when more than one is requested
+        """
+        if transport_modes is None:
+            transport_modes = [
+                r5py.TransportMode.WALK,
+                r5py.TransportMode.TRANSIT
+            ]
+
+        percentiles = sorted(percentiles)
+        results = r5py.TravelTimeMatrix(
+            self.transport_network,
+            origins=origins,
+            destinations=destinations,
+            transport_modes=transport_modes,
+            departure=departure_time,
+            departure_time_window=timedelta(minutes=window_minutes),
+            percentiles=percentiles,
+            max_time=timedelta(minutes=self.max_trip_duration),
+            speed_walking=self.walking_speed
+        )
+
+        # r5py names the column travel_time only for a single percentile
+        if 'travel_time' not in results.columns:
+            middle = percentiles[len(percentiles) // 2]
+            results['travel_time'] = results[f'travel_time_p{middle}']
+
+        return results
+
     def calculate_route_at_time(
         self,
         origin_lat: float,
@@ -142,6 +205,151 @@ class R5Router:
 
         return float(travel_time_minutes)
 
+    def calculate_travel_time_series(
+        self,
+        origin_lat: float,
+        origin_lon: float,
+        dest_lat: float,
+        dest_lon: float,
+        departure_times: Sequence[datetime],
+        verbose: bool = False,
+        max_workers: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate travel times in both directions for a series of departures.
+
+        Args:
+            origin_lat: Origin latitude
+            origin_lon: Origin longitude
+            dest_lat: Destination latitude
+            dest_lon: Destination longitude
+            departure_times: Departure datetimes
+            verbose: Show progress bar
+            max_workers: Number of departures to route concurrently
+
+        Returns:
+            Tuple of (outbound, return) arrays of travel times in minutes,
+            one entry per departure, NaN where no route was found
+        """
+        outbound, inbound = self.calculate_travel_time_matrix_series(
+            np.array([origin_lat]), np.array([origin_lon]),
+            dest_lat, dest_lon,
+            departure_times,
+            verbose=verbose,
+            max_workers=max_workers
+        )
+        return outbound[0], inbound[0]
+
+    def calculate_travel_time_matrix_series(
+        self,
+        origin_lats: np.ndarray,
+        origin_lons: np.ndarray,
+        dest_lat: float,
+        dest_lon: float,
+        departure_times: Sequence[datetime],
+        verbose: bool = False,
+        max_workers: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate travel times between many origins and one destination,
+        in both directions, for a series of departures.
+
+        The origins and the destination are built into GeoDataFrames once,
+        and each departure is two matrix computations, origins→destination
+        and destination→origins, so the JVM round trips are shared by all
+        origins and the work grows linearly with them. Departures are routed
+        concurrently on a thread pool; R5 runs in the JVM, so the Python
+        threads spend their time outside the GIL.
+
+        Args:
+            origin_lats: Origin latitudes
+            origin_lons: Origin longitudes
+            dest_lat: Destination latitude
+            dest_lon: Destination longitude
+            departure_times: Departure datetimes
+            verbose: Show progress bar
+            max_workers: Number of departures to route concurrently
+
+        Returns:
+            Tuple of (outbound, return) arrays of travel times in minutes,
+            shape (origins, departures), NaN where no route was found
+        """
+        n_origins = len(origin_lats)
+
+        # Origins have ids 0..n-1, the destination has id 0
+        origins = gpd.GeoDataFrame(
+            {'id': np.arange(n_origins)},
+            geometry=gpd.points_from_xy(origin_lons, origin_lats),
+            crs='EPSG:4326'
+        )
+        destination = gpd.GeoDataFrame(
+            {'id': [0]},
+            geometry=gpd.points_from_xy([dest_lon], [dest_lat]),
+            crs='EPSG:4326'
+        )
+
+        shape = (n_origins, len(departure_times))
+        outbound = np.full(shape, np.nan, dtype=np.float32)
+        inbound = np.full(shape, np.nan, dtype=np.float32)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._route_both_directions, origins, destination, departure_time): i
+                for i, departure_time in enumerate(departure_times)
+            }
+
+            with tqdm(
+                total=len(futures),
+                desc="Analyzing",
+                mininterval=0.5,
+                miniters=32,
+                disable=not verbose
+            ) as progress:
+                for future in as_completed(futures):
+                    i = futures[future]
+                    outbound[:, i], inbound[:, i] = future.result()
+                    progress.update(1)
+
+        return outbound, inbound
+
+    def _route_both_directions(
+        self,
+        origins: gpd.GeoDataFrame,
+        destination: gpd.GeoDataFrame,
+        departure_time: datetime
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Route between every origin of a series and its destination, both ways.
+
+        Each direction is its own origins×1 matrix, so no origin→origin
+        pair is ever routed.
+
+        Args:
+            origins: GeoDataFrame of origins with ids 0..n-1
+            destination: GeoDataFrame of the single destination
+            departure_time: Departure datetime
+
+        Returns:
+            Tuple of (outbound, return) arrays of travel times in minutes,
+            one entry per origin, NaN if unreachable
+        """
+        n_origins = len(origins)
+
+        outbound_results = self.calculate_travel_times(origins, destination, departure_time)
+        inbound_results = self.calculate_travel_times(destination, origins, departure_time)
+
+        outbound = np.full(n_origins, np.nan)
+        inbound = np.full(n_origins, np.nan)
+
+        outbound[outbound_results['from_id'].to_numpy()] = outbound_results['travel_time'].to_numpy(
+            dtype=float, na_value=np.nan
+        )
+        inbound[inbound_results['to_id'].to_numpy()] = inbound_results['travel_time'].to_numpy(
+            dtype=float, na_value=np.nan
+        )
+
+        return outbound, inbound
+
 
 def download_osm_data(
     place_name: str = "Pittsburgh, Pennsylvania, USA",
@@ -202,8 +410,7 @@ def main():
         sys.exit(1)
 
     # Load config
-    with open('config.example.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config('config.example.yaml')
 
     # Check for OSM data
     osm_path = Path("data/pennsylvania.osm.pbf")
@@ -241,6 +448,26 @@ def main():
         else:
             print("\nNo route found")
 
+        # Same trip across a 60-minute departure window, in one search
+        origins = gpd.GeoDataFrame(
+            {'id': [0]},
+            geometry=gpd.points_from_xy([origin_lon], [origin_lat]),
+            crs='EPSG:4326'
+        )
+        destinations = gpd.GeoDataFrame(
+            {'id': [0]},
+            geometry=gpd.points_from_xy([dest_lon], [dest_lat]),
+            crs='EPSG:4326'
+        )
+        window = router.calculate_travel_times_window(
+            origins, destinations, departure, window_minutes=60
+        )
+        median_time = window['travel_time'].iloc[0] if not window.empty else None
+        if pd.notna(median_time):
+            print(f"Median travel time, 8:30-9:30 departures: {median_time:.1f} minutes")
+        else:
+            print("No route found in the 8:30-9:30 window")
+
     except Exception as e:
         print(f"\nError initializing router: {e}")
         print("\nMake sure you have:")
@@ -250,4 +477,5 @@ def main():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
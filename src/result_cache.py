@@ -0,0 +1,137 @@
+"""
+Resumable on-disk cache of per-point heat map results.
+
+Each analyzed grid point is written to SQLite as soon as it is scored, so
+an interrupted heat map run can pick up where it stopped and re-runs with
+the same work location and analysis settings skip the router entirely.
+"""
+
+import hashlib
+import pickle
+import sqlite3
+from typing import Dict, Optional
+
+
+def result_context(
+    work_lat: float,
+    work_lon: float,
+    time_window_start: str,
+    time_window_end: str,
+    analysis_date: str,
+    max_walk_time: int,
+    max_trip_duration: int,
+    walking_speed: float,
+    max_transit_speed_mph: float,
+    data_fingerprint: str,
+    prune_speed_mph: Optional[float] = None,
+    prune_threshold: Optional[float] = None
+) -> str:
+    """
+    Describe everything besides (lat, lon) that a point's result depends on.
+
+    Both heat map generators build their cache context here, so they agree
+    on what invalidates a stored result.
+
+    Args:
+        work_lat: Work location latitude
+        work_lon: Work location longitude
+        time_window_start: Start time (HH:MM)
+        time_window_end: End time (HH:MM)
+        analysis_date: Date for analysis (YYYY-MM-DD)
+        max_walk_time: Router's maximum walking time in minutes
+        max_trip_duration: Router's maximum trip duration in minutes
+        walking_speed: Router's walking speed in km/h
+        max_transit_speed_mph: Analyzer's straight-line speed gate; homes it
+            rules out get no travel times
+        data_fingerprint: Fingerprint of the GTFS and OSM inputs
+        prune_speed_mph: Generator's lower-bound pruning speed, if it prunes
+        prune_threshold: Generator's lower-bound pruning score threshold
+
+    Returns:
+        Context string for PointResultCache
+    """
+    def hhmm(value: str) -> str:
+        hour, minute = value.split(':')[:2]
+        return f"{int(hour):02d}:{int(minute):02d}"
+
+    def setting(value: Optional[float]) -> str:
+        return 'none' if value is None else f"{value:.4f}"
+
+    return (
+        f"{work_lat:.6f},{work_lon:.6f} "
+        f"{hhmm(time_window_start)}-{hhmm(time_window_end)} {analysis_date} "
+        f"walk={max_walk_time} trip={max_trip_duration} speed={walking_speed:.4f} "
+        f"gate={max_transit_speed_mph:.4f} "
+        f"prune={setting(prune_speed_mph)}/{setting(prune_threshold)} "
+        f"{data_fingerprint}"
+    )
+
+
+class PointResultCache:
+    """
+    SQLite store of point results keyed by analysis context and (lat, lon).
+
+    Several processes may open the same file; writes wait for each other.
+    """
+
+    def __init__(self, path: str, context: str, commit_every: int = 32):
+        """
+        Open (creating if needed) the results database.
+
+        Args:
+            path: SQLite database file
+            context: Description of everything besides (lat, lon) that the
+                results depend on (work location, time window, date, ...)
+            commit_every: Commit after this many new results
+        """
+        self.context = hashlib.sha1(context.encode()).hexdigest()
+        self.commit_every = commit_every
+        self._pending = 0
+
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS points ('
+            'context TEXT, lat_e6 INT, lon_e6 INT, score REAL, payload BLOB, '
+            'PRIMARY KEY (context, lat_e6, lon_e6))'
+        )
+
+    @staticmethod
+    def _key(lat: float, lon: float):
+        """Integer microdegrees, stable against floating-point drift."""
+        return int(round(lat * 1e6)), int(round(lon * 1e6))
+
+    def get(self, lat: float, lon: float) -> Optional[Dict]:
+        """
+        Look up a stored point result.
+
+        Returns:
+            The stored result, or None if the point has not been analyzed
+        """
+        row = self._db.execute(
+            'SELECT payload FROM points WHERE context = ? AND lat_e6 = ? AND lon_e6 = ?',
+            (self.context, *self._key(lat, lon))
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def put(self, lat: float, lon: float, result: Dict) -> None:
+        """Store a point result (committed in batches of commit_every)."""
+        self._db.execute(
+            'INSERT OR REPLACE INTO points (context, lat_e6, lon_e6, score, payload) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (self.context, *self._key(lat, lon), result.get('score'),
+             pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        )
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.commit()
+
+    def commit(self) -> None:
+        """Write any uncommitted results to disk."""
+        self._db.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.commit()
+        self._db.close()
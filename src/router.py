@@ -7,10 +7,13 @@ Calculates fastest route between two points considering:
 - One transfer
 """
 
+import logging
 from typing import Tuple, List, Dict, Optional
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
-from gtfs_loader import GTFSLoader
+from gtfs_loader import GTFSLoader, MISSING_TIME
 from street_network import StreetNetwork
 from dataclasses import dataclass
 
@@ -49,7 +52,8 @@ class Router:
         max_walk_miles: float = 1.0,
         walking_speed_mph: float = 4.0,
         max_transfers: int = 1,
-        max_transfer_wait_minutes: int = 30
+        max_transfer_wait_minutes: int = 30,
+        walk_cache_size: int = 4096
     ):
         """
         Initialize router.
@@ -61,6 +65,7 @@ class Router:
             walking_speed_mph: Walking speed
             max_transfers: Maximum number of transfers
             max_transfer_wait_minutes: Maximum wait time between transfers
+            walk_cache_size: Maximum number of points whose stop walks are cached
         """
         self.gtfs = gtfs_loader
         self.network = street_network
@@ -69,9 +74,43 @@ class Router:
         self.max_transfers = max_transfers
         self.max_transfer_wait_minutes = max_transfer_wait_minutes
 
+        # LRU cache of _stop_walks() results keyed by rounded point and
+        # direction; repeated origins and destinations skip the stop search
+        # and the street-network Dijkstra
+        self.walk_cache_size = walk_cache_size
+        self._walk_cache = OrderedDict()
+
         # Get weekday service IDs
         self.weekday_services = set(self.gtfs.get_weekday_service_ids())
 
+        # Weekday stop times with the trip's route, built once so routing
+        # only filters and merges. Stops without a scheduled time can be
+        # neither scored nor compared, so they are left out.
+        weekday_trips = self.gtfs.trips.loc[
+            self.gtfs.trips['service_id'].isin(self.weekday_services),
+            ['trip_id', 'route_id']
+        ]
+        stop_times = self.gtfs.stop_times[
+            ['trip_id', 'stop_id', 'stop_sequence', 'arrival_seconds', 'departure_seconds']
+        ]
+        scheduled = (
+            (stop_times['arrival_seconds'] != MISSING_TIME) &
+            (stop_times['departure_seconds'] != MISSING_TIME)
+        )
+        self._weekday_stop_times = stop_times[scheduled].merge(
+            weekday_trips, on='trip_id'
+        )
+        # Row positions of each stop's and each trip's weekday stop times
+        self._weekday_rows_by_stop = self._weekday_stop_times.groupby(
+            'stop_id', observed=True
+        ).indices
+        self._weekday_rows_by_trip = self._weekday_stop_times.groupby(
+            'trip_id', observed=True
+        ).indices
+
+        # routes.txt rows by route_id, for describing the chosen route
+        self._routes_by_id = self.gtfs.routes.set_index('route_id', drop=False).to_dict('index')
+
     def find_fastest_route(
         self,
         origin_lat: float,
@@ -93,6 +132,58 @@ class Router:
         Returns:
             Route object or None if no route found
         """
+        # Walking legs to the stops near each end
+        origin_walks = self._stop_walks(origin_lat, origin_lon, to_stops=True)
+        dest_walks = self._stop_walks(dest_lat, dest_lon, to_stops=False)
+
+        return self._fastest_route(
+            origin_lat, origin_lon,
+            dest_lat, dest_lon,
+            origin_walks, dest_walks,
+            departure_time
+        )
+
+    def find_fastest_routes(self, pairs: pd.DataFrame) -> pd.DataFrame:
+        """
+        Find fastest routes for many origin-destination pairs.
+
+        Pairs sharing an origin or destination reuse its cached walks to
+        nearby stops.
+
+        Args:
+            pairs: DataFrame with columns origin_lat, origin_lon, dest_lat,
+                dest_lon and departure_time
+
+        Returns:
+            DataFrame with the index of pairs and columns arrival_time,
+            total_time_minutes (NaN if no route) and route (Route or None)
+        """
+        routes = [
+            self.find_fastest_route(
+                pair.origin_lat, pair.origin_lon,
+                pair.dest_lat, pair.dest_lon,
+                pair.departure_time
+            )
+            for pair in pairs.itertuples(index=False)
+        ]
+
+        return pd.DataFrame({
+            'arrival_time': [route.arrival_time if route else None for route in routes],
+            'total_time_minutes': [route.total_time_minutes if route else np.nan for route in routes],
+            'route': routes
+        }, index=pairs.index)
+
+    def _fastest_route(
+        self,
+        origin_lat: float,
+        origin_lon: float,
+        dest_lat: float,
+        dest_lon: float,
+        origin_walks: Optional[pd.DataFrame],
+        dest_walks: Optional[pd.DataFrame],
+        departure_time: datetime
+    ) -> Optional[Route]:
+        """Fastest of the walk-only and transit routes, given the walks to nearby stops."""
         routes = []
 
         # Option 1: Walk only
@@ -105,13 +196,15 @@ class Router:
             routes.append(walk_route)
 
         # Option 2: Transit (direct or one transfer)
-        transit_route = self._calculate_transit_route(
-            origin_lat, origin_lon,
-            dest_lat, dest_lon,
-            departure_time
-        )
-        if transit_route:
-            routes.append(transit_route)
+        if origin_walks is not None and dest_walks is not None:
+            transit_route = self._calculate_transit_route(
+                origin_lat, origin_lon,
+                dest_lat, dest_lon,
+                origin_walks, dest_walks,
+                departure_time
+            )
+            if transit_route:
+                routes.append(transit_route)
 
         # Return fastest route
         if routes:
@@ -160,29 +253,42 @@ class Router:
         origin_lon: float,
         dest_lat: float,
         dest_lon: float,
+        origin_walks: pd.DataFrame,
+        dest_walks: pd.DataFrame,
         departure_time: datetime
     ) -> Optional[Route]:
         """Calculate best transit route (direct or one transfer)."""
-        # Find accessible stops near origin and destination
-        origin_stops = self.gtfs.find_stops_within_radius(
-            origin_lat, origin_lon,
-            self.max_walk_miles
+        # All schedule arithmetic is in integer seconds since midnight;
+        # datetimes are only built for the winning route
+        departure_seconds = (
+            departure_time.hour * 3600 + departure_time.minute * 60 + departure_time.second
         )
 
-        dest_stops = self.gtfs.find_stops_within_radius(
-            dest_lat, dest_lon,
-            self.max_walk_miles
+        # Time we reach each origin stop
+        origin_walks = origin_walks.assign(
+            ready_seconds=departure_seconds + origin_walks['walk_seconds']
         )
 
-        if origin_stops.empty or dest_stops.empty:
-            return None
+        # Trips we can catch at the origin stops and leave at the
+        # destination stops, shared by the direct and transfer searches
+        boardings = self._stop_times_at(
+            origin_walks['stop_id'],
+            ['trip_id', 'stop_id', 'stop_sequence', 'departure_seconds', 'route_id']
+        ).merge(origin_walks, on='stop_id')
+        # Only trips departing after we arrive at the stop
+        boardings = boardings[boardings['departure_seconds'] >= boardings['ready_seconds']]
+
+        alightings = self._stop_times_at(
+            dest_walks['stop_id'],
+            ['trip_id', 'stop_id', 'stop_sequence', 'arrival_seconds']
+        ).merge(dest_walks, on='stop_id')
 
         # Try direct routes
         best_route = self._find_direct_route(
             origin_lat, origin_lon,
             dest_lat, dest_lon,
-            origin_stops, dest_stops,
-            departure_time
+            boardings, alightings,
+            departure_time, departure_seconds
         )
 
         # Try one-transfer routes if allowed
@@ -190,8 +296,8 @@ class Router:
             transfer_route = self._find_one_transfer_route(
                 origin_lat, origin_lon,
                 dest_lat, dest_lon,
-                origin_stops, dest_stops,
-                departure_time
+                boardings, alightings,
+                departure_time, departure_seconds
             )
 
             if transfer_route and (not best_route or
@@ -206,145 +312,184 @@ class Router:
         origin_lon: float,
         dest_lat: float,
         dest_lon: float,
-        origin_stops: pd.DataFrame,
-        dest_stops: pd.DataFrame,
-        departure_time: datetime
+        boardings: pd.DataFrame,
+        alightings: pd.DataFrame,
+        departure_time: datetime,
+        departure_seconds: int
     ) -> Optional[Route]:
-        """Find fastest direct route (no transfers)."""
-        departure_seconds = departure_time.hour * 3600 + departure_time.minute * 60
-
-        best_route = None
-        best_time = float('inf')
+        """
+        Find fastest direct route (no transfers).
 
-        for _, orig_stop in origin_stops.iterrows():
-            # Walking time to origin stop
-            walk_to_stop_dist, walk_to_stop_time = self.network.get_walking_distance(
-                origin_lat, origin_lon,
-                orig_stop['stop_lat'], orig_stop['stop_lon'],
-                self.walking_speed_mph
-            )
+        Every (origin stop, destination stop) pair on the same weekday trip
+        is scored at once with one merge of the boardings and alightings.
+        """
+        trips = boardings.merge(alightings, on='trip_id', suffixes=('_o', '_d'))
+        # The destination stop must come after the origin stop on the trip
+        trips = trips[trips['stop_sequence_d'] > trips['stop_sequence_o']]
 
-            if walk_to_stop_dist is None:
-                continue
+        if trips.empty:
+            return None
 
-            # Find trips from this stop
-            stop_times_from = self.gtfs.stop_times[
-                (self.gtfs.stop_times['stop_id'] == orig_stop['stop_id'])
-            ].copy()
+        # Walk to the stop plus the wait always ends at the bus departure, so
+        # the total is (arrival at the destination stop + final walk) minus
+        # our departure: one argmin, and the legs only for the winner
+        finish_seconds = (
+            trips['arrival_seconds'].to_numpy() + trips['walk_seconds_d'].to_numpy()
+        )
+        best = int(np.argmin(finish_seconds))
+        trip = trips.iloc[best]
 
-            if stop_times_from.empty:
-                continue
+        total_seconds = int(finish_seconds[best] - departure_seconds)
+        total_minutes = total_seconds / 60
+        wait_minutes = float(trip['departure_seconds'] - trip['ready_seconds']) / 60
+        transit_minutes = float(trip['arrival_seconds'] - trip['departure_seconds']) / 60
+        arrival_time = departure_time + timedelta(seconds=total_seconds)
 
-            # Convert departure_time to seconds
-            stop_times_from['departure_seconds'] = stop_times_from['departure_time'].apply(
-                self._time_str_to_seconds
-            )
+        # Get route info
+        route_info = self._route_info(trip['route_id'])
 
-            # Filter to trips departing after we arrive at stop
-            arrival_at_stop_seconds = departure_seconds + walk_to_stop_time * 60
-            stop_times_from = stop_times_from[
-                stop_times_from['departure_seconds'] >= arrival_at_stop_seconds
+        return Route(
+            origin_lat=origin_lat,
+            origin_lon=origin_lon,
+            dest_lat=dest_lat,
+            dest_lon=dest_lon,
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+            total_time_minutes=total_minutes,
+            legs=[
+                {
+                    'type': 'walk',
+                    'description': f"Walk {trip['walk_miles_o']:.2f} mi to {trip['stop_name_o']} ({trip['walk_minutes_o']:.1f} min)",
+                    'distance_miles': trip['walk_miles_o'],
+                    'time_minutes': trip['walk_minutes_o']
+                },
+                {
+                    'type': 'wait',
+                    'description': f"Wait for bus ({wait_minutes:.1f} min)",
+                    'time_minutes': wait_minutes
+                },
+                {
+                    'type': 'transit',
+                    'description': f"Take Route {route_info['route_short_name']} ({transit_minutes:.1f} min)",
+                    'route': route_info['route_short_name'],
+                    'time_minutes': transit_minutes
+                },
+                {
+                    'type': 'walk',
+                    'description': f"Walk {trip['walk_miles_d']:.2f} mi to destination ({trip['walk_minutes_d']:.1f} min)",
+                    'distance_miles': trip['walk_miles_d'],
+                    'time_minutes': trip['walk_minutes_d']
+                }
             ]
+        )
 
-            # Filter to weekday service
-            stop_times_from = stop_times_from.merge(
-                self.gtfs.trips[['trip_id', 'service_id', 'route_id']],
-                on='trip_id'
-            )
-            stop_times_from = stop_times_from[
-                stop_times_from['service_id'].isin(self.weekday_services)
-            ]
+    def _route_info(self, route_id) -> Dict:
+        """Get the routes.txt row for a route."""
+        return self._routes_by_id[route_id]
 
-            # Check each destination stop
-            for _, dest_stop in dest_stops.iterrows():
-                # Find trips that go to this destination
-                common_trips = stop_times_from[
-                    stop_times_from['trip_id'].isin(
-                        self.gtfs.stop_times[
-                            self.gtfs.stop_times['stop_id'] == dest_stop['stop_id']
-                        ]['trip_id']
-                    )
-                ]
-
-                for _, trip_from_orig in common_trips.iterrows():
-                    # Get arrival time at destination
-                    trip_to_dest = self.gtfs.stop_times[
-                        (self.gtfs.stop_times['trip_id'] == trip_from_orig['trip_id']) &
-                        (self.gtfs.stop_times['stop_id'] == dest_stop['stop_id'])
-                    ]
-
-                    if trip_to_dest.empty:
-                        continue
-
-                    arrival_at_dest_stop_seconds = self._time_str_to_seconds(
-                        trip_to_dest.iloc[0]['arrival_time']
-                    )
-
-                    # Walking time from destination stop
-                    walk_from_stop_dist, walk_from_stop_time = self.network.get_walking_distance(
-                        dest_stop['stop_lat'], dest_stop['stop_lon'],
-                        dest_lat, dest_lon,
-                        self.walking_speed_mph
-                    )
-
-                    if walk_from_stop_dist is None:
-                        continue
-
-                    # Calculate total time
-                    total_seconds = (
-                        walk_to_stop_time * 60 +
-                        (trip_from_orig['departure_seconds'] - arrival_at_stop_seconds) +  # Wait time
-                        (arrival_at_dest_stop_seconds - trip_from_orig['departure_seconds']) +  # Transit time
-                        walk_from_stop_time * 60
-                    )
-
-                    total_minutes = total_seconds / 60
-
-                    if total_minutes < best_time:
-                        best_time = total_minutes
-                        arrival_time = departure_time + timedelta(minutes=total_minutes)
-
-                        # Get route info
-                        route_info = self.gtfs.routes[
-                            self.gtfs.routes['route_id'] == trip_from_orig['route_id']
-                        ].iloc[0]
-
-                        best_route = Route(
-                            origin_lat=origin_lat,
-                            origin_lon=origin_lon,
-                            dest_lat=dest_lat,
-                            dest_lon=dest_lon,
-                            departure_time=departure_time,
-                            arrival_time=arrival_time,
-                            total_time_minutes=total_minutes,
-                            legs=[
-                                {
-                                    'type': 'walk',
-                                    'description': f"Walk {walk_to_stop_dist:.2f} mi to {orig_stop['stop_name']} ({walk_to_stop_time:.1f} min)",
-                                    'distance_miles': walk_to_stop_dist,
-                                    'time_minutes': walk_to_stop_time
-                                },
-                                {
-                                    'type': 'wait',
-                                    'description': f"Wait for bus ({(trip_from_orig['departure_seconds'] - arrival_at_stop_seconds) / 60:.1f} min)",
-                                    'time_minutes': (trip_from_orig['departure_seconds'] - arrival_at_stop_seconds) / 60
-                                },
-                                {
-                                    'type': 'transit',
-                                    'description': f"Take Route {route_info['route_short_name']} ({(arrival_at_dest_stop_seconds - trip_from_orig['departure_seconds']) / 60:.1f} min)",
-                                    'route': route_info['route_short_name'],
-                                    'time_minutes': (arrival_at_dest_stop_seconds - trip_from_orig['departure_seconds']) / 60
-                                },
-                                {
-                                    'type': 'walk',
-                                    'description': f"Walk {walk_from_stop_dist:.2f} mi to destination ({walk_from_stop_time:.1f} min)",
-                                    'distance_miles': walk_from_stop_dist,
-                                    'time_minutes': walk_from_stop_time
-                                }
-                            ]
-                        )
+    @staticmethod
+    def _rows_for(index: Dict, keys) -> np.ndarray:
+        """Concatenate the row positions that a groupby().indices index holds for keys."""
+        rows = [index[key] for key in keys if key in index]
+        return np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
 
-        return best_route
+    def _stop_times_at(self, stop_ids: pd.Series, columns: List[str]) -> pd.DataFrame:
+        """
+        Weekday stop times at the given stops, looked up by index.
+
+        Args:
+            stop_ids: Stop IDs
+            columns: Columns to return
+
+        Returns:
+            DataFrame of the matching weekday stop times
+        """
+        rows = self._rows_for(self._weekday_rows_by_stop, stop_ids)
+        return self._weekday_stop_times[columns].take(rows)
+
+    def _stop_times_on(self, trip_ids: pd.Series, columns: List[str]) -> pd.DataFrame:
+        """
+        Weekday stop times of the given trips, looked up by index.
+
+        Args:
+            trip_ids: Trip IDs
+            columns: Columns to return
+
+        Returns:
+            DataFrame of the matching weekday stop times
+        """
+        rows = self._rows_for(self._weekday_rows_by_trip, trip_ids)
+        return self._weekday_stop_times[columns].take(rows)
+
+    def _stop_walks(self, lat: float, lon: float, to_stops: bool) -> Optional[pd.DataFrame]:
+        """
+        Walks between a point and the stops within walking distance of it.
+
+        Results are cached by the point rounded to 1e-5 degrees (about 1 m).
+        The returned DataFrame is shared, so callers must not modify it.
+
+        Args:
+            lat: Point latitude
+            lon: Point longitude
+            to_stops: Walk from the point to the stops (else from the stops)
+
+        Returns:
+            DataFrame from _walks_to_stops(), or None if no stop is in range
+        """
+        key = (round(lat, 5), round(lon, 5), to_stops)
+        if key in self._walk_cache:
+            self._walk_cache.move_to_end(key)
+            return self._walk_cache[key]
+
+        stops = self.gtfs.find_stops_within_radius(lat, lon, self.max_walk_miles)
+        if stops.empty:
+            walks = None
+        else:
+            walks = self._walks_to_stops(stops, lat, lon, to_stops=to_stops)
+
+        self._walk_cache[key] = walks
+        if len(self._walk_cache) > self.walk_cache_size:
+            self._walk_cache.popitem(last=False)
+        return walks
+
+    def _walks_to_stops(
+        self,
+        stops: pd.DataFrame,
+        lat: float,
+        lon: float,
+        to_stops: bool
+    ) -> pd.DataFrame:
+        """
+        Walking distance and time between a point and each of some stops.
+
+        Args:
+            stops: Stops from GTFSLoader.find_stops_within_radius()
+            lat: Point latitude
+            lon: Point longitude
+            to_stops: Walk from the point to the stops (else from the stops)
+
+        Returns:
+            DataFrame of stop_id, stop_name, walk_miles, walk_minutes and
+            walk_seconds for the stops that can be walked to
+        """
+        walk_miles, walk_minutes = self.network.get_walking_distances(
+            lat, lon,
+            stops['stop_lat'].to_numpy(), stops['stop_lon'].to_numpy(),
+            self.walking_speed_mph,
+            to_stops=to_stops
+        )
+
+        walkable = ~np.isnan(walk_miles)
+        walk_minutes = walk_minutes[walkable]
+        return pd.DataFrame({
+            # Masking the Categorical keeps its codes and the shared dtype
+            'stop_id': stops['stop_id'].array[walkable],
+            'stop_name': stops['stop_name'].to_numpy()[walkable],
+            'walk_miles': walk_miles[walkable],
+            'walk_minutes': walk_minutes,
+            # Whole seconds, rounded up, for schedule arithmetic
+            'walk_seconds': np.ceil(walk_minutes * 60).astype(np.int32)
+        })
 
     def _find_one_transfer_route(
         self,
@@ -352,45 +497,146 @@ class Router:
         origin_lon: float,
         dest_lat: float,
         dest_lon: float,
-        origin_stops: pd.DataFrame,
-        dest_stops: pd.DataFrame,
-        departure_time: datetime
+        boardings: pd.DataFrame,
+        alightings: pd.DataFrame,
+        departure_time: datetime,
+        departure_seconds: int
     ) -> Optional[Route]:
-        """Find fastest route with one transfer."""
-        # For now, return None (transfers are complex to implement)
-        # Will implement if needed for Stage 3
-        return None
+        """
+        Find fastest route with one transfer.
 
-    def _time_str_to_seconds(self, time_str: str) -> int:
+        Two RAPTOR-style rounds over the weekday stop times: the first finds
+        every arrival at the stops the boardable trips reach, the second
+        boards trips at those stops (within the transfer wait limit of some
+        arrival) that continue to a destination stop. Transfers are at the
+        same stop.
         """
-        Convert GTFS time string to seconds since midnight.
+        # Round 1: board each trip at its earliest reachable stop, which
+        # gives the most stops further along the trip
+        first_legs = (
+            boardings.sort_values('stop_sequence')
+            .drop_duplicates('trip_id')
+            .add_suffix('_o')
+        )
+        rides = self._stop_times_on(
+            first_legs['trip_id_o'],
+            ['trip_id', 'stop_id', 'stop_sequence', 'arrival_seconds']
+        ).merge(first_legs, left_on='trip_id', right_on='trip_id_o')
+        rides = rides[rides['stop_sequence'] > rides['stop_sequence_o']].drop(
+            columns=['trip_id', 'stop_sequence']
+        )
 
-        GTFS times can be > 24:00:00 for trips past midnight.
+        # Round 2: trips leaving the stops the rides reach that also reach a
+        # destination stop
+        second_legs = self._stop_times_at(
+            rides['stop_id'].drop_duplicates(),
+            ['trip_id', 'stop_id', 'stop_sequence', 'departure_seconds', 'route_id']
+        )
+        # Keep trips that also serve a destination stop, intersecting the
+        # shared categorical's integer codes
+        second_legs = second_legs[np.isin(
+            second_legs['trip_id'].cat.codes.to_numpy(),
+            alightings['trip_id'].cat.codes.to_numpy()
+        )]
+        # Pair each departure with every ride arriving at its stop, so the
+        # wait limit is checked against all arrivals: an earlier arrival may
+        # wait too long where a later one makes the connection
+        second_legs = second_legs.merge(rides, on='stop_id')
+
+        transfer_wait = second_legs['departure_seconds'] - second_legs['arrival_seconds']
+        second_legs = second_legs[
+            (transfer_wait >= 0) &
+            (transfer_wait <= self.max_transfer_wait_minutes * 60) &
+            (second_legs['trip_id'] != second_legs['trip_id_o'])
+        ]
+
+        # The finish only depends on the second trip and where it is boarded;
+        # keep the latest arrival (shortest transfer wait) for each
+        second_legs = (
+            second_legs.sort_values('arrival_seconds', kind='stable')
+            .drop_duplicates(['trip_id', 'stop_id'], keep='last')
+        )
 
-        Args:
-            time_str: Time string like "08:30:00" or "25:30:00"
+        journeys = second_legs.merge(
+            alightings.add_suffix('_d'), left_on='trip_id', right_on='trip_id_d'
+        )
+        journeys = journeys[journeys['stop_sequence_d'] > journeys['stop_sequence']]
 
-        Returns:
-            Seconds since midnight
-        """
-        try:
-            parts = time_str.split(':')
-            hours = int(parts[0])
-            minutes = int(parts[1])
-            seconds = int(parts[2])
-            return hours * 3600 + minutes * 60 + seconds
-        except:
-            return 0
+        if journeys.empty:
+            return None
+
+        finish_seconds = (
+            journeys['arrival_seconds_d'].to_numpy() + journeys['walk_seconds_d'].to_numpy()
+        )
+        best = int(np.argmin(finish_seconds))
+        trip = journeys.iloc[best]
+
+        total_seconds = int(finish_seconds[best] - departure_seconds)
+        total_minutes = total_seconds / 60
+        wait_minutes = float(trip['departure_seconds_o'] - trip['ready_seconds_o']) / 60
+        first_minutes = float(trip['arrival_seconds'] - trip['departure_seconds_o']) / 60
+        transfer_minutes = float(trip['departure_seconds'] - trip['arrival_seconds']) / 60
+        second_minutes = float(trip['arrival_seconds_d'] - trip['departure_seconds']) / 60
+        arrival_time = departure_time + timedelta(seconds=total_seconds)
+
+        first_route = self._route_info(trip['route_id_o'])
+        second_route = self._route_info(trip['route_id'])
+        transfer_stop = self.gtfs.stops[self.gtfs.stops['stop_id'] == trip['stop_id']].iloc[0]
+
+        return Route(
+            origin_lat=origin_lat,
+            origin_lon=origin_lon,
+            dest_lat=dest_lat,
+            dest_lon=dest_lon,
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+            total_time_minutes=total_minutes,
+            legs=[
+                {
+                    'type': 'walk',
+                    'description': f"Walk {trip['walk_miles_o']:.2f} mi to {trip['stop_name_o']} ({trip['walk_minutes_o']:.1f} min)",
+                    'distance_miles': trip['walk_miles_o'],
+                    'time_minutes': trip['walk_minutes_o']
+                },
+                {
+                    'type': 'wait',
+                    'description': f"Wait for bus ({wait_minutes:.1f} min)",
+                    'time_minutes': wait_minutes
+                },
+                {
+                    'type': 'transit',
+                    'description': f"Take Route {first_route['route_short_name']} to {transfer_stop['stop_name']} ({first_minutes:.1f} min)",
+                    'route': first_route['route_short_name'],
+                    'time_minutes': first_minutes
+                },
+                {
+                    'type': 'wait',
+                    'description': f"Transfer, wait for bus ({transfer_minutes:.1f} min)",
+                    'time_minutes': transfer_minutes
+                },
+                {
+                    'type': 'transit',
+                    'description': f"Take Route {second_route['route_short_name']} ({second_minutes:.1f} min)",
+                    'route': second_route['route_short_name'],
+                    'time_minutes': second_minutes
+                },
+                {
+                    'type': 'walk',
+                    'description': f"Walk {trip['walk_miles_d']:.2f} mi to destination ({trip['walk_minutes_d']:.1f} min)",
+                    'distance_miles': trip['walk_miles_d'],
+                    'time_minutes': trip['walk_minutes_d']
+                }
+            ]
+        )
 
 
 def main():
     """Test the router."""
-    import yaml
+    from config_loader import load_config
     from geocoder import Geocoder
 
     # Load config
-    with open('config.example.yaml', 'r') as f:
-        config = yaml.safe_load(f)
+    config = load_config('config.example.yaml')
 
     # Initialize components
     print("Initializing router...")
@@ -444,4 +690,5 @@ def main():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
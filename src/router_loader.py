@@ -0,0 +1,52 @@
+"""
+Shared r5py router construction.
+
+Builds an R5Router from config.yaml settings the same way for every
+script, converting the config's miles and mph into the router's units.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict
+
+from r5py_router import R5Router
+
+
+def input_fingerprint(*paths: str) -> str:
+    """
+    Fingerprint input files from their size and first megabyte.
+
+    Args:
+        paths: Files to fingerprint
+
+    Returns:
+        Hex digest identifying the file contents
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        path = Path(path)
+        digest.update(str(path.resolve()).encode())
+        digest.update(str(path.stat().st_size).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read(1 << 20))
+    return digest.hexdigest()
+
+
+def load_router(config: Dict, osm_path: str) -> R5Router:
+    """
+    Build an R5Router for the config.
+
+    Args:
+        config: Parsed config.yaml (walking speed in mph, distances in miles)
+        osm_path: Path to OSM PBF file
+
+    Returns:
+        Router for the configured GTFS feed and OSM extract
+    """
+    return R5Router(
+        gtfs_path=config['gtfs_path'],
+        osm_path=str(osm_path),
+        max_walk_time=int(config['max_walk_to_stop'] * 60 / config['walking_speed']),
+        max_trip_duration=config['max_trip_time'],
+        walking_speed=config['walking_speed'] * 1.60934  # mph to km/h
+    )
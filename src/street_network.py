@@ -2,22 +2,58 @@
 Street network utilities for calculating walking distances and times.
 """
 
+import logging
+import math
+from collections import OrderedDict
 import osmnx as ox
-import networkx as nx
 from typing import Tuple, Optional
 import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial import cKDTree
 from pathlib import Path
 
+from geo import haversine_miles, unit_xyz
+
+
+logger = logging.getLogger(__name__)
+
+METERS_PER_MILE = 1609.34
+
+# Straight-line distance is scaled by this to estimate walking distance
+# when no street network is loaded
+DETOUR_FACTOR = 1.3
+
+# A single-pair search first stops at this many times the straight-line
+# distance (and at least MIN_SEARCH_METERS) before searching the whole graph
+SEARCH_LIMIT_FACTOR = 4
+MIN_SEARCH_METERS = 2000.0
+
+
+def _pair_key(lat1: float, lon1: float, lat2: float, lon2: float) -> int:
+    """
+    Pack a point pair into one int for cache lookups.
+
+    Coordinates are quantized to 1e-5 degrees (about 1 m) and each takes
+    26 bits, so hashing the key is a single int hash rather than a tuple
+    of four floats.
+    """
+    key = 0
+    for value, offset in ((lat1, 90), (lon1, 180), (lat2, 90), (lon2, 180)):
+        key = (key << 26) | int(round((value + offset) * 1e5))
+    return key
+
 
 class StreetNetwork:
     """Calculate walking distances using OpenStreetMap street network."""
 
-    def __init__(self, cache_dir: str = "cache/osm"):
+    def __init__(self, cache_dir: str = "cache/osm", cache_size: int = 200_000):
         """
         Initialize street network.
 
         Args:
             cache_dir: Directory to cache OSM data
+            cache_size: Maximum number of point-pair distances to cache
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -27,7 +63,16 @@ class StreetNetwork:
         ox.settings.cache_folder = str(self.cache_dir)
 
         self.graph = None
-        self._distance_cache = {}
+
+        # LRU cache of walking distance (miles, None if no path) keyed by
+        # _pair_key(); times depend on walking speed, so they are not cached
+        self.cache_size = cache_size
+        self._distance_cache = OrderedDict()
+
+        # Arrays for batch routing, built by load_network()
+        self._node_tree = None
+        self._edges = None
+        self._edges_reversed = None
 
     def load_network(
         self,
@@ -39,8 +84,8 @@ class StreetNetwork:
         Args:
             place_name: Name of place to download network for
         """
-        print(f"Loading street network for {place_name}...")
-        print("  (This may take a few minutes on first run, then will be cached)")
+        logger.info("Loading street network for %s "
+                    "(may take a few minutes on first run, then cached)", place_name)
 
         try:
             # Download walk network
@@ -48,13 +93,88 @@ class StreetNetwork:
                 place_name,
                 network_type='walk'
             )
-            print(f"  ✓ Loaded street network with {len(self.graph.nodes)} nodes")
+            logger.info("Loaded street network with %d nodes", len(self.graph.nodes))
+            self._build_routing_arrays()
 
         except Exception as e:
-            print(f"  ✗ Error loading street network: {e}")
-            print("  → Will use straight-line distances with 1.3x multiplier as fallback")
+            logger.warning("Error loading street network: %s; falling back to "
+                           "straight-line distances with a %.1fx multiplier", e, DETOUR_FACTOR)
             self.graph = None
 
+    def _build_routing_arrays(self) -> None:
+        """
+        Index the graph for batch routing.
+
+        Nodes go in a k-d tree (unit-sphere coordinates) for snapping points,
+        and edges into a CSR matrix of lengths in meters that scipy's
+        Dijkstra runs on. Parallel edges keep their shortest length.
+        """
+        nodes = list(self.graph.nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        node_lat = np.array([self.graph.nodes[n]['y'] for n in nodes], dtype=np.float64)
+        node_lon = np.array([self.graph.nodes[n]['x'] for n in nodes], dtype=np.float64)
+        self._node_tree = cKDTree(unit_xyz(node_lat, node_lon))
+
+        edges = list(self.graph.edges(data='length', default=0.0))
+        u = np.array([index[e[0]] for e in edges], dtype=np.int64)
+        v = np.array([index[e[1]] for e in edges], dtype=np.int64)
+        # csgraph drops zero entries, so zero-length edges get a tiny length
+        length = np.maximum(np.array([e[2] for e in edges], dtype=np.float64), 1e-6)
+
+        # Shortest of each set of parallel edges: sort by (u, v, length)
+        # and keep the first of every (u, v)
+        order = np.lexsort((length, v, u))
+        u, v, length = u[order], v[order], length[order]
+        first = np.ones(len(u), dtype=bool)
+        first[1:] = (u[1:] != u[:-1]) | (v[1:] != v[:-1])
+
+        n = len(nodes)
+        self._edges = csr_matrix((length[first], (u[first], v[first])), shape=(n, n))
+        self._edges_reversed = self._edges.T.tocsr()
+
+    def many_to_many(
+        self,
+        orig_lats: np.ndarray,
+        orig_lons: np.ndarray,
+        dest_lats: np.ndarray,
+        dest_lons: np.ndarray
+    ) -> np.ndarray:
+        """
+        Street-network walking distances between every origin and destination.
+
+        All points are snapped to their nearest nodes in one k-d tree query,
+        then one Dijkstra call runs from whichever side has fewer distinct
+        nodes (over the reversed graph when that is the destinations).
+
+        Args:
+            orig_lats: Origin latitudes
+            orig_lons: Origin longitudes
+            dest_lats: Destination latitudes
+            dest_lons: Destination longitudes
+
+        Returns:
+            Array of distances in miles, shape (origins, destinations),
+            NaN where no path exists
+        """
+        if self._edges is None:
+            raise RuntimeError("Street network not loaded; call load_network() first")
+
+        _, orig_nodes = self._node_tree.query(unit_xyz(orig_lats, orig_lons))
+        _, dest_nodes = self._node_tree.query(unit_xyz(dest_lats, dest_lons))
+        orig_sources, orig_rows = np.unique(orig_nodes, return_inverse=True)
+        dest_sources, dest_rows = np.unique(dest_nodes, return_inverse=True)
+
+        if len(orig_sources) <= len(dest_sources):
+            meters = dijkstra(self._edges, indices=orig_sources)
+            meters = meters[np.ix_(orig_rows, dest_nodes)]
+        else:
+            meters = dijkstra(self._edges_reversed, indices=dest_sources)
+            meters = meters[np.ix_(dest_rows, orig_nodes)].T
+
+        miles = meters / METERS_PER_MILE
+        miles[np.isinf(miles)] = np.nan
+        return miles
+
     def get_walking_distance(
         self,
         lat1: float,
@@ -77,76 +197,108 @@ class StreetNetwork:
             Tuple of (distance_miles, time_minutes) or (None, None) if unreachable
         """
         # Check cache
-        cache_key = (round(lat1, 5), round(lon1, 5), round(lat2, 5), round(lon2, 5))
+        cache_key = _pair_key(lat1, lon1, lat2, lon2)
         if cache_key in self._distance_cache:
-            return self._distance_cache[cache_key]
+            self._distance_cache.move_to_end(cache_key)
+            distance_miles = self._distance_cache[cache_key]
+        else:
+            distance_miles = self._walking_distance_miles(lat1, lon1, lat2, lon2)
+            self._distance_cache[cache_key] = distance_miles
+            if len(self._distance_cache) > self.cache_size:
+                self._distance_cache.popitem(last=False)
+
+        if distance_miles is None:
+            # No path exists
+            return (None, None)
+
+        # Calculate time in minutes
+        time_minutes = (distance_miles / miles_per_hour) * 60
+        return (distance_miles, time_minutes)
 
+    def _walking_distance_miles(
+        self,
+        lat1: float,
+        lon1: float,
+        lat2: float,
+        lon2: float
+    ) -> Optional[float]:
+        """Walking distance in miles between two points, None if no path."""
         if self.graph is None:
             # Fallback to straight-line distance with multiplier
-            distance_miles = self._haversine_distance(lat1, lon1, lat2, lon2) * 1.3
-            time_minutes = (distance_miles / miles_per_hour) * 60
-            result = (distance_miles, time_minutes)
-            self._distance_cache[cache_key] = result
-            return result
+            return float(haversine_miles(lat1, lon1, lat2, lon2)) * DETOUR_FACTOR
 
-        try:
-            # Find nearest nodes
-            orig_node = ox.distance.nearest_nodes(self.graph, lon1, lat1)
-            dest_node = ox.distance.nearest_nodes(self.graph, lon2, lat2)
-
-            # Calculate shortest path
-            path_length = nx.shortest_path_length(
-                self.graph,
-                orig_node,
-                dest_node,
-                weight='length'
-            )
+        # Find nearest nodes, both in one k-d tree query
+        _, (orig_node, dest_node) = self._node_tree.query(unit_xyz([lat1, lat2], [lon1, lon2]))
 
-            # Convert meters to miles
-            distance_miles = path_length / 1609.34
+        # Calculate shortest path
+        straight_meters = float(haversine_miles(lat1, lon1, lat2, lon2)) * METERS_PER_MILE
+        path_length = self._path_meters(int(orig_node), int(dest_node), straight_meters)
+        if math.isinf(path_length):
+            return None
 
-            # Calculate time in minutes
-            time_minutes = (distance_miles / miles_per_hour) * 60
+        # Convert meters to miles
+        return path_length / METERS_PER_MILE
 
-            result = (distance_miles, time_minutes)
-            self._distance_cache[cache_key] = result
-            return result
+    def _path_meters(self, source: int, target: int, straight_meters: float) -> float:
+        """
+        Shortest path length in meters between two graph nodes.
 
-        except (nx.NetworkXNoPath, nx.NodeNotFound):
-            # No path exists
-            return (None, None)
+        scipy's Dijkstra stops at a multiple of the straight-line distance
+        first; a path within that limit is already the shortest, and only
+        a target beyond it needs a search of the whole graph.
+
+        Args:
+            source: Row of the origin node in the edge matrix
+            target: Row of the destination node in the edge matrix
+            straight_meters: Straight-line distance between the points
+
+        Returns:
+            Path length in meters, inf if no path exists
+        """
+        if source == target:
+            return 0.0
+
+        limit = max(SEARCH_LIMIT_FACTOR * straight_meters, MIN_SEARCH_METERS)
+        meters = dijkstra(self._edges, indices=source, limit=limit)[target]
+        if np.isinf(meters):
+            meters = dijkstra(self._edges, indices=source)[target]
+        return float(meters)
 
-    def _haversine_distance(
+    def get_walking_distances(
         self,
-        lat1: float,
-        lon1: float,
-        lat2: float,
-        lon2: float
-    ) -> float:
+        lat: float,
+        lon: float,
+        stop_lats: np.ndarray,
+        stop_lons: np.ndarray,
+        miles_per_hour: float = 4.0,
+        to_stops: bool = True
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Calculate straight-line distance between two points using Haversine formula.
+        Calculate walking distances and times between a point and many stops.
+
+        Without a street network the whole batch is one vectorized haversine;
+        with one, it is a single many_to_many() Dijkstra call.
 
         Args:
-            lat1: Origin latitude
-            lon1: Origin longitude
-            lat2: Destination latitude
-            lon2: Destination longitude
+            lat: Point latitude
+            lon: Point longitude
+            stop_lats: Stop latitudes
+            stop_lons: Stop longitudes
+            miles_per_hour: Walking speed (default: 4.0 mph)
+            to_stops: Walk from the point to the stops (else from the stops)
 
         Returns:
-            Distance in miles
+            Tuple of (distance_miles, time_minutes) arrays, NaN where unreachable
         """
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
-
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-        c = 2 * np.arcsin(np.sqrt(a))
+        if self.graph is None:
+            distance_miles = haversine_miles(lat, lon, stop_lats, stop_lons) * DETOUR_FACTOR
+            return distance_miles, distance_miles / miles_per_hour * 60
 
-        # Earth radius in miles
-        r = 3959
-        return c * r
+        if to_stops:
+            distance_miles = self.many_to_many([lat], [lon], stop_lats, stop_lons)[0]
+        else:
+            distance_miles = self.many_to_many(stop_lats, stop_lons, [lat], [lon])[:, 0]
+        return distance_miles, distance_miles / miles_per_hour * 60
 
 
 def main():
@@ -182,4 +334,5 @@ def main():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     main()
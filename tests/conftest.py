@@ -0,0 +1,11 @@
+"""
+Shared pytest setup.
+
+The modules in src/ import each other as top-level modules (the scripts
+are run from inside src/), so src/ is put on the import path here.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
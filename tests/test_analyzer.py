@@ -0,0 +1,79 @@
+"""
+Tests for TimeDistributionAnalyzer with a stand-in router.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('r5py')
+
+from analyzer import TimeDistributionAnalyzer
+
+
+WORK_LAT, WORK_LON = 40.4443, -79.9436
+
+
+class FixedRouter:
+    """Router that answers every departure with the same travel times."""
+
+    max_trip_duration = 60
+
+    def __init__(self, outbound: float, inbound: float):
+        self.outbound = outbound
+        self.inbound = inbound
+        self.calls = 0
+
+    def calculate_travel_time_matrix_series(
+        self, origin_lats, origin_lons, dest_lat, dest_lon, departure_times,
+        verbose=False, max_workers=1
+    ):
+        self.calls += 1
+        shape = (len(origin_lats), len(departure_times))
+        return np.full(shape, self.outbound), np.full(shape, self.inbound)
+
+
+def make_analyzer(router):
+    return TimeDistributionAnalyzer(
+        router, WORK_LAT, WORK_LON,
+        time_window_start='08:00',
+        time_window_end='08:09',
+        analysis_date='2025-11-19',
+        max_workers=1
+    )
+
+
+def test_analyze_locations_end_to_end():
+    router = FixedRouter(outbound=20.0, inbound=30.0)
+    analyzer = make_analyzer(router)
+
+    # One home nearby, one too far away to reach work within the trip limit
+    results = analyzer.analyze_locations(
+        np.array([40.4520, 42.0]), np.array([-79.9280, -75.0]), verbose=False
+    )
+
+    near, far = results
+    assert near['total_samples'] == 20
+    assert near['unreachable_count'] == 0
+    assert list(near['to_work_times']) == [20.0] * 10
+    assert list(near['from_work_times']) == [30.0] * 10
+    assert near['statistics']['min'] == 20.0
+    assert near['statistics']['max'] == 30.0
+    assert near['statistics']['mean'] == 25.0
+    assert near['reachable_ratio'] == 1.0
+    assert analyzer.get_score(near) == 30.0
+
+    assert len(far['times']) == 0
+    assert far['unreachable_count'] == 20
+    assert analyzer.get_score(far) is None
+
+
+def test_analyze_location_uses_cache():
+    router = FixedRouter(outbound=12.5, inbound=14.5)
+    analyzer = make_analyzer(router)
+
+    first = analyzer.analyze_location(40.4520, -79.9280, verbose=False)
+    second = analyzer.analyze_location(40.4520, -79.9280, verbose=False)
+
+    assert router.calls == 1
+    assert first['percentiles'] == second['percentiles']
+    assert first['statistics']['median'] == 13.5
@@ -0,0 +1,50 @@
+"""
+Tests for R5Router's batching, with the r5py matrix call replaced.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('r5py')
+
+from r5py_router import R5Router
+
+
+class MatrixRecorder(R5Router):
+    """R5Router whose travel time matrix is a fixed function of the point ids."""
+
+    def __init__(self):
+        self.matrix_sizes = []
+
+    def calculate_travel_times(self, origins, destinations, departure_time, transport_modes=None):
+        self.matrix_sizes.append((len(origins), len(destinations)))
+        pairs = pd.MultiIndex.from_product(
+            [origins['id'], destinations['id']], names=['from_id', 'to_id']
+        ).to_frame(index=False)
+        # Outbound trips take 10 + origin minutes, return trips 20 + origin;
+        # origin 1 cannot reach the destination
+        outbound = len(destinations) == 1
+        origin_ids = pairs['from_id'] if outbound else pairs['to_id']
+        travel_time = origin_ids + (10 if outbound else 20)
+        pairs['travel_time'] = travel_time.astype('Int64').mask(origin_ids == 1)
+        return pairs
+
+
+def test_matrix_series_routes_each_direction_separately():
+    router = MatrixRecorder()
+    departures = [datetime(2025, 11, 19, 8, 0), datetime(2025, 11, 19, 8, 1)]
+
+    outbound, inbound = router.calculate_travel_time_matrix_series(
+        np.array([40.44, 40.45, 40.46]), np.array([-79.99, -79.98, -79.97]),
+        40.4443, -79.9436,
+        departures
+    )
+
+    # Two origins×1 matrices per departure, never the (origins + 1)² one
+    assert sorted(router.matrix_sizes) == [(1, 3), (1, 3), (3, 1), (3, 1)]
+
+    np.testing.assert_array_equal(outbound[:, 0], [10, np.nan, 12])
+    np.testing.assert_array_equal(inbound[:, 1], [20, np.nan, 22])
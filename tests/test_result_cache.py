@@ -0,0 +1,49 @@
+"""
+Tests for the heat map result cache context.
+"""
+
+from result_cache import PointResultCache, result_context
+
+
+BASE = dict(
+    work_lat=40.4443, work_lon=-79.9436,
+    time_window_start='6:00', time_window_end='19:00',
+    analysis_date='2025-11-19',
+    max_walk_time=15, max_trip_duration=60, walking_speed=4.8,
+    max_transit_speed_mph=45.0,
+    data_fingerprint='abc',
+    prune_speed_mph=45.0, prune_threshold=60
+)
+
+
+def test_every_setting_changes_the_context():
+    base = result_context(**BASE)
+    changes = dict(
+        work_lat=40.5, time_window_end='18:00', analysis_date='2025-11-20',
+        max_walk_time=10, max_trip_duration=90, walking_speed=5.0,
+        max_transit_speed_mph=30.0, data_fingerprint='def',
+        prune_speed_mph=None, prune_threshold=45
+    )
+    for name, value in changes.items():
+        assert result_context(**dict(BASE, **{name: value})) != base, name
+
+
+def test_equivalent_times_share_a_context():
+    assert result_context(**BASE) == result_context(**dict(BASE, time_window_start='06:00'))
+
+
+def test_changed_gate_misses_old_entries(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    point = {'lat': 40.45, 'lon': -79.93, 'score': 30.0}
+
+    cache = PointResultCache(path, result_context(**BASE))
+    cache.put(40.45, -79.93, point)
+    cache.close()
+
+    same = PointResultCache(path, result_context(**BASE))
+    assert same.get(40.45, -79.93) == point
+    same.close()
+
+    changed = PointResultCache(path, result_context(**dict(BASE, max_transit_speed_mph=30.0)))
+    assert changed.get(40.45, -79.93) is None
+    changed.close()
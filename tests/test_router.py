@@ -0,0 +1,98 @@
+"""
+Tests for Router on a small hand-made GTFS feed.
+"""
+
+import zipfile
+from datetime import datetime
+
+import pytest
+
+from gtfs_loader import GTFSLoader
+from street_network import StreetNetwork
+from router import Router
+
+
+# Origin stop, transfer stop and destination stop, a few miles apart so
+# that no stop is within walking distance of another
+ORIGIN = (40.4400, -79.9900)
+TRANSFER = (40.4600, -79.9500)
+DESTINATION = (40.4800, -79.9100)
+
+
+def write_feed(path, stop_times):
+    """Write a weekday GTFS feed with the given stop_times.txt rows."""
+    files = {
+        'stops.txt': [
+            'stop_id,stop_name,stop_lat,stop_lon',
+            f'A,Origin Stop,{ORIGIN[0]},{ORIGIN[1]}',
+            f'T,Transfer Stop,{TRANSFER[0]},{TRANSFER[1]}',
+            f'D,Destination Stop,{DESTINATION[0]},{DESTINATION[1]}',
+        ],
+        'routes.txt': [
+            'route_id,route_short_name,route_long_name',
+            'R1,1,First Early',
+            'R2,2,First Late',
+            'R3,3,Second',
+        ],
+        'trips.txt': [
+            'route_id,service_id,trip_id',
+            'R1,WK,F1',
+            'R2,WK,F2',
+            'R3,WK,S',
+        ],
+        'stop_times.txt': ['trip_id,arrival_time,departure_time,stop_id,stop_sequence'] + stop_times,
+        'calendar.txt': [
+            'service_id,monday,tuesday,wednesday,thursday,friday,saturday,sunday,start_date,end_date',
+            'WK,1,1,1,1,1,0,0,20250101,20251231',
+        ],
+    }
+    with zipfile.ZipFile(path, 'w') as zf:
+        for name, lines in files.items():
+            zf.writestr(name, '\n'.join(lines) + '\n')
+
+
+@pytest.fixture
+def router(tmp_path):
+    gtfs_path = tmp_path / 'gtfs.zip'
+    write_feed(gtfs_path, [
+        # Two first legs reach the transfer stop, 30 minutes apart
+        'F1,07:50:00,07:50:00,A,1',
+        'F1,08:00:00,08:00:00,T,2',
+        'F2,08:20:00,08:20:00,A,1',
+        'F2,08:30:00,08:30:00,T,2',
+        # The second leg leaves 35 minutes after the first arrival but only
+        # 5 minutes after the second
+        'S,08:35:00,08:35:00,T,1',
+        'S,08:50:00,08:50:00,D,2',
+    ])
+    loader = GTFSLoader(str(gtfs_path))
+    loader.load()
+
+    return Router(
+        loader,
+        StreetNetwork(cache_dir=str(tmp_path / 'osm')),
+        max_walk_miles=0.5,
+        max_transfer_wait_minutes=20
+    )
+
+
+def test_transfer_uses_later_arrival_within_wait_limit(router):
+    route = router.find_fastest_route(*ORIGIN, *DESTINATION, datetime(2025, 11, 19, 7, 45))
+
+    assert route is not None
+    assert route.arrival_time == datetime(2025, 11, 19, 8, 50)
+    assert route.total_time_minutes == 65
+
+    first_leg, transfer_wait = route.legs[2], route.legs[3]
+    assert first_leg['route'] == '2'
+    assert transfer_wait['time_minutes'] == 5
+
+
+def test_no_transfer_when_every_arrival_waits_too_long(router):
+    # Both first legs can be caught, but even the later one arrives 5
+    # minutes before the second leg leaves
+    router.max_transfer_wait_minutes = 4
+
+    route = router.find_fastest_route(*ORIGIN, *DESTINATION, datetime(2025, 11, 19, 7, 45))
+
+    assert route is None